@@ -1,5 +1,6 @@
 """Sample contract PDF generator for testing the contract intelligence system"""
 
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
@@ -8,95 +9,139 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 import os
 
+# Sample content is plain text, so skip ReportLab's per-shape argument checks
+rl_config.shapeChecking = 0
+
+# Shared stylesheet (building it is comparatively expensive)
+styles = getSampleStyleSheet()
+
+SERVICE_AGREEMENT_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=styles['Heading1'],
+    fontSize=18,
+    spaceAfter=30,
+    alignment=1  # Center
+)
+
+VENDOR_CONTRACT_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=styles['Heading1'],
+    fontSize=16,
+    spaceAfter=20,
+    alignment=1
+)
+
+SECTION_HEADERS = frozenset({
+    "PARTIES", "FINANCIAL DETAILS", "LINE ITEMS", "PAYMENT STRUCTURE",
+    "SERVICE LEVEL AGREEMENTS", "ACCOUNT INFORMATION", "REVENUE CLASSIFICATION",
+    "ADDITIONAL TERMS",
+})
+
+# Service agreement content as (label, value) rows; blank rows separate sections
+SERVICE_AGREEMENT_CONTENT = [
+    ("Contract ID:", "CTR-2024-001"),
+    ("Effective Date:", "January 1, 2024"),
+    ("", ""),
+    ("PARTIES", ""),
+    ("", ""),
+    ("Service Provider:", "TechCorp Solutions Inc."),
+    ("Legal Entity:", "Delaware Corporation"),
+    ("Address:", "123 Technology Drive, San Francisco, CA 94105"),
+    ("Authorized Signatory:", "John Smith, CEO"),
+    ("", ""),
+    ("Client:", "Global Industries Ltd."),
+    ("Legal Entity:", "Limited Company"),
+    ("Address:", "456 Business Ave, New York, NY 10001"),
+    ("Authorized Signatory:", "Jane Doe, CTO"),
+    ("", ""),
+    ("FINANCIAL DETAILS", ""),
+    ("", ""),
+    ("Total Contract Value:", "$150,000 USD"),
+    ("Currency:", "United States Dollars (USD)"),
+    ("Tax Rate:", "8.5%"),
+    ("", ""),
+    ("LINE ITEMS", ""),
+    ("Software Development Services  1  $120,000  $120,000", ""),
+    ("Technical Support  12  $2,500  $30,000", ""),
+    ("", ""),
+    ("PAYMENT STRUCTURE", ""),
+    ("", ""),
+    ("Payment Terms:", "Net 30 days"),
+    ("Payment Schedule:", "Monthly billing cycle"),
+    ("Payment Method:", "Wire Transfer"),
+    ("Bank Details:", "Chase Bank - Account #1234567890"),
+    ("", ""),
+    ("SERVICE LEVEL AGREEMENTS", ""),
+    ("", ""),
+    ("Response Time:", "4 hours for critical issues"),
+    ("Uptime Guarantee:", "99.9% monthly uptime"),
+    ("Penalty Clause:", "5% monthly fee reduction for < 99% uptime"),
+    ("", ""),
+    ("ACCOUNT INFORMATION", ""),
+    ("", ""),
+    ("Account Number:", "ACC-2024-001"),
+    ("Billing Contact:", "billing@techcorp.com"),
+    ("Technical Contact:", "support@techcorp.com"),
+    ("Phone:", "(555) 123-4567"),
+    ("", ""),
+    ("REVENUE CLASSIFICATION", ""),
+    ("", ""),
+    ("Service Type:", "Recurring monthly subscription"),
+    ("Billing Cycle:", "Monthly on the 1st"),
+    ("Auto-renewal:", "Automatically renews unless cancelled 30 days prior"),
+    ("", ""),
+    ("ADDITIONAL TERMS", ""),
+    ("", ""),
+    ("Contract Duration:", "12 months from effective date"),
+    ("Termination Notice:", "30 days written notice required"),
+    ("Governing Law:", "State of California"),
+]
+
+
+def _build_content_table_style(content):
+    """Build the TableStyle for a (label, value) content table"""
+    commands = [
+        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+        ("FONTNAME", (1, 0), (1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+    ]
+    for row, (item, value) in enumerate(content):
+        if item == "":
+            commands.append(("FONTSIZE", (0, row), (-1, row), 4))
+        elif item in SECTION_HEADERS:
+            commands.append(("SPAN", (0, row), (1, row)))
+            commands.append(("FONTSIZE", (0, row), (0, row), 14))
+            commands.append(("BOTTOMPADDING", (0, row), (0, row), 6))
+        elif not value:
+            # Free-text rows (e.g. line items) span both columns in the body font
+            commands.append(("SPAN", (0, row), (1, row)))
+            commands.append(("FONTNAME", (0, row), (0, row), "Helvetica"))
+    return TableStyle(commands)
+
+
+SERVICE_AGREEMENT_TABLE_STYLE = _build_content_table_style(SERVICE_AGREEMENT_CONTENT)
+
+
 def create_sample_contract_1():
     """Create a comprehensive service agreement PDF"""
     filename = "sample_contract_service_agreement.pdf"
     doc = SimpleDocTemplate(filename, pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
     
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=1  # Center
-    )
-    story.append(Paragraph("SERVICE AGREEMENT", title_style))
+    story.append(Paragraph("SERVICE AGREEMENT", SERVICE_AGREEMENT_TITLE_STYLE))
     story.append(Spacer(1, 20))
     
-    # Contract details
-    content = [
-        ("Contract ID:", "CTR-2024-001"),
-        ("Effective Date:", "January 1, 2024"),
-        ("", ""),
-        ("PARTIES", ""),
-        ("", ""),
-        ("Service Provider:", "TechCorp Solutions Inc."),
-        ("Legal Entity:", "Delaware Corporation"),
-        ("Address:", "123 Technology Drive, San Francisco, CA 94105"),
-        ("Authorized Signatory:", "John Smith, CEO"),
-        ("", ""),
-        ("Client:", "Global Industries Ltd."),
-        ("Legal Entity:", "Limited Company"),
-        ("Address:", "456 Business Ave, New York, NY 10001"),
-        ("Authorized Signatory:", "Jane Doe, CTO"),
-        ("", ""),
-        ("FINANCIAL DETAILS", ""),
-        ("", ""),
-        ("Total Contract Value:", "$150,000 USD"),
-        ("Currency:", "United States Dollars (USD)"),
-        ("Tax Rate:", "8.5%"),
-        ("", ""),
-        ("LINE ITEMS", ""),
-        ("Software Development Services  1  $120,000  $120,000", ""),
-        ("Technical Support  12  $2,500  $30,000", ""),
-        ("", ""),
-        ("PAYMENT STRUCTURE", ""),
-        ("", ""),
-        ("Payment Terms:", "Net 30 days"),
-        ("Payment Schedule:", "Monthly billing cycle"),
-        ("Payment Method:", "Wire Transfer"),
-        ("Bank Details:", "Chase Bank - Account #1234567890"),
-        ("", ""),
-        ("SERVICE LEVEL AGREEMENTS", ""),
-        ("", ""),
-        ("Response Time:", "4 hours for critical issues"),
-        ("Uptime Guarantee:", "99.9% monthly uptime"),
-        ("Penalty Clause:", "5% monthly fee reduction for < 99% uptime"),
-        ("", ""),
-        ("ACCOUNT INFORMATION", ""),
-        ("", ""),
-        ("Account Number:", "ACC-2024-001"),
-        ("Billing Contact:", "billing@techcorp.com"),
-        ("Technical Contact:", "support@techcorp.com"),
-        ("Phone:", "(555) 123-4567"),
-        ("", ""),
-        ("REVENUE CLASSIFICATION", ""),
-        ("", ""),
-        ("Service Type:", "Recurring monthly subscription"),
-        ("Billing Cycle:", "Monthly on the 1st"),
-        ("Auto-renewal:", "Automatically renews unless cancelled 30 days prior"),
-        ("", ""),
-        ("ADDITIONAL TERMS", ""),
-        ("", ""),
-        ("Contract Duration:", "12 months from effective date"),
-        ("Termination Notice:", "30 days written notice required"),
-        ("Governing Law:", "State of California"),
-    ]
-    
-    for item, value in content:
-        if item == "":
-            story.append(Spacer(1, 12))
-        elif item in ["PARTIES", "FINANCIAL DETAILS", "LINE ITEMS", "PAYMENT STRUCTURE", 
-                      "SERVICE LEVEL AGREEMENTS", "ACCOUNT INFORMATION", "REVENUE CLASSIFICATION", 
-                      "ADDITIONAL TERMS"]:
-            story.append(Paragraph(item, styles['Heading2']))
-            story.append(Spacer(1, 6))
-        else:
-            text = f"<b>{item}</b> {value}" if value else item
-            story.append(Paragraph(text, styles['Normal']))
+    # Contract details as a single table of plain strings
+    table = Table(
+        [[item, value] for item, value in SERVICE_AGREEMENT_CONTENT],
+        colWidths=[2.5 * inch, 4 * inch],
+        hAlign="LEFT",
+        style=SERVICE_AGREEMENT_TABLE_STYLE
+    )
+    story.append(table)
     
     doc.build(story)
     return filename
@@ -106,17 +151,9 @@ def create_sample_contract_2():
     filename = "sample_contract_vendor_agreement.pdf"
     doc = SimpleDocTemplate(filename, pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
     
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=20,
-        alignment=1
-    )
-    story.append(Paragraph("VENDOR SERVICES CONTRACT", title_style))
+    story.append(Paragraph("VENDOR SERVICES CONTRACT", VENDOR_CONTRACT_TITLE_STYLE))
     story.append(Spacer(1, 20))
     
     content = """
@@ -148,7 +185,6 @@ def create_sample_contract_3():
     filename = "sample_contract_lease_agreement.pdf"
     doc = SimpleDocTemplate(filename, pagesize=letter)
     story = []
-    styles = getSampleStyleSheet()
     
     content = """
     COMMERCIAL LEASE AGREEMENT
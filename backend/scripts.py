@@ -27,6 +27,8 @@ Usage: python scripts.py <command>
 Available commands:
   start       - Start the FastAPI server
   celery      - Start the Celery worker
+  beat        - Start the Celery beat scheduler
+  migrate     - Upgrade contracts stored by older versions
   test        - Run tests with coverage
   format      - Format code with Black
   lint        - Check code with Ruff
@@ -40,6 +42,8 @@ Available commands:
     commands = {
         "start": ("uv run uvicorn src.main:app --reload --host 0.0.0.0 --port 8000", "Starting FastAPI server..."),
         "celery": ("uv run celery -A src.tasks.celery worker --loglevel=info", "Starting Celery worker..."),
+        "beat": ("uv run celery -A src.tasks.celery beat --loglevel=info", "Starting Celery beat..."),
+        "migrate": ("uv run python -m src.database.migrations", "Migrating contracts..."),
         "test": ("uv run pytest tests/ -v --cov=src --cov-report=term-missing", "Running tests..."),
         "format": ("uv run black src/ tests/", "Formatting code..."),
         "lint": ("uv run ruff check src/ tests/", "Linting code..."),
@@ -1,29 +1,69 @@
 """API routers and endpoints for contract intelligence system"""
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
-from fastapi.responses import StreamingResponse, JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, AsyncIterator
+import asyncio
+import hashlib
 import logging
-from io import BytesIO
+import orjson
+import time
+from gridfs import AsyncGridOut
+from gridfs.errors import NoFile
 
-from src.database.models import get_contracts_collection
-from src.tasks.celery import parse_contract
-from src.core.utils import generate_contract_id, validate_file, get_current_timestamp
-from src.core.config import MAX_FILE_SIZE
+from src.api.responses import ORJSONResponse
+from src.database.models import get_async_contracts_collection, get_async_files_bucket
+from src.tasks.celery import parse_contract, run_parse_contract
+from src.core.utils import (
+    generate_contract_id, validate_file_stream,
+    get_current_timestamp, get_current_datetime
+)
+from src.core.config import MAX_FILE_SIZE, UPLOAD_CHUNK_SIZE, STATS_CACHE_TTL
 from src.core.exceptions import FileValidationError, ContractNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Sort fields backed by an index on the contracts collection
+SORTABLE_FIELDS = {"upload_date", "updated_at"}
+
+# In-process cache for the statistics response
+_stats_cache: Dict[str, Any] = {"payload": None, "etag": None, "expires_at": 0.0}
+
+
+def _invalidate_stats_cache():
+    """Drop the cached statistics so the next request recomputes them"""
+    _stats_cache["expires_at"] = 0.0
+
 # Create API router
 router = APIRouter(prefix="/api/v1", tags=["contracts"])
 
 
+def _parse_in_local_pool(request: Request, contract_id: str):
+    """Hand a contract to the app's process pool when Celery can't take it"""
+    pool = getattr(request.app.state, "extractor_pool", None)
+    if pool is None:
+        return
+    
+    def log_failure(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Local processing failed for contract %s: %s", contract_id, future.exception())
+    
+    try:
+        future = asyncio.get_running_loop().run_in_executor(pool, run_parse_contract, contract_id)
+    except Exception as e:
+        logger.error("Failed to start local processing: %s", e)
+        return
+    future.add_done_callback(log_failure)
+    logger.info("Started local processing for contract %s", contract_id)
+
+
 @router.post("/contracts/upload", response_model=Dict[str, str])
-async def upload_contract(file: UploadFile = File(...)):
+async def upload_contract(request: Request, file: UploadFile = File(...)):
     """
     Upload a contract PDF for processing
     
     Args:
+        request: Incoming request, used to reach the local extractor pool
         file: PDF file to upload
         
     Returns:
@@ -33,45 +73,73 @@ async def upload_contract(file: UploadFile = File(...)):
         HTTPException: If file validation fails
     """
     try:
-        logger.info(f"Received file upload: {file.filename}")
+        logger.info("Received file upload: %s", file.filename)
         
-        # Read file data
-        file_data = await file.read()
-        
-        # Validate file
-        validate_file(file_data, file.filename or "", MAX_FILE_SIZE)
+        # Reject bad names, non-PDFs and oversized files from the spooled
+        # upload before touching the database or the task queue
+        file_size = validate_file_stream(file.file, file.filename or "", MAX_FILE_SIZE)
         
         # Generate contract ID
         contract_id = generate_contract_id()
+        hasher = hashlib.sha1()
+        
+        try:
+            grid_in = get_async_files_bucket().open_upload_stream(file.filename or f"{contract_id}.pdf")
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            raise HTTPException(status_code=503, detail="Database service unavailable")
+        
+        # Stream the PDF into GridFS chunk by chunk
+        try:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            while chunk:
+                hasher.update(chunk)
+                await grid_in.write(chunk)
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            await grid_in.close()
+        except Exception as e:
+            await grid_in.abort()
+            logger.error("Database error: %s", e)
+            raise HTTPException(status_code=503, detail="Database service unavailable")
         
-        # Store contract in database
+        # Store the contract metadata in the database
         try:
-            contracts = get_contracts_collection()
+            contracts = get_async_contracts_collection()
+            now = get_current_datetime()
             contract_doc = {
+                "_id": contract_id,
                 "contract_id": contract_id,
                 "filename": file.filename,
-                "file_size": len(file_data),
+                "file_size": file_size,
                 "status": "pending",
                 "progress": 0,
-                "original_file": file_data,
-                "upload_date": get_current_timestamp(),
-                "created_at": get_current_timestamp(),
-                "updated_at": get_current_timestamp()
+                "file_id": grid_in._id,
+                "etag": hasher.hexdigest(),
+                "upload_date": now,
+                "created_at": now,
+                "updated_at": now
             }
             
-            contracts.insert_one(contract_doc)
-            logger.info(f"Stored contract {contract_id} in database")
+            await contracts.insert_one(contract_doc)
+            _invalidate_stats_cache()
+            logger.info("Stored contract %s in database", contract_id)
         except Exception as e:
-            logger.error(f"Database error: {str(e)}")
+            logger.error("Database error: %s", e)
+            # Nothing references the stored PDF without its contract document
+            try:
+                await get_async_files_bucket().delete(grid_in._id)
+            except Exception as cleanup_error:
+                logger.warning("Failed to remove orphaned file for contract %s: %s", contract_id, cleanup_error)
             raise HTTPException(status_code=503, detail="Database service unavailable")
         
         # Start async processing
         try:
             parse_contract.delay(contract_id)
-            logger.info(f"Started async processing for contract {contract_id}")
+            logger.info("Started async processing for contract %s", contract_id)
         except Exception as e:
-            logger.error(f"Failed to start async processing: {str(e)}")
-            # Continue anyway as contract is stored
+            logger.error("Failed to start async processing: %s", e)
+            # Continue anyway as contract is stored, parsing it locally if we can
+            _parse_in_local_pool(request, contract_id)
         
         return {
             "contract_id": contract_id,
@@ -80,15 +148,17 @@ async def upload_contract(file: UploadFile = File(...)):
         }
         
     except FileValidationError as e:
-        logger.warning(f"File validation failed: {str(e)}")
+        logger.warning("File validation failed: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Upload failed: {str(e)}")
+        logger.error("Upload failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
 @router.get("/contracts/{contract_id}/status", response_model=Dict[str, Any])
-def get_contract_status(contract_id: str):
+async def get_contract_status(contract_id: str):
     """
     Get processing status for a contract
     
@@ -102,8 +172,12 @@ def get_contract_status(contract_id: str):
         HTTPException: If contract not found
     """
     try:
-        contracts = get_contracts_collection()
-        contract = contracts.find_one({"contract_id": contract_id})
+        contracts = get_async_contracts_collection()
+        contract = await contracts.find_one(
+            {"_id": contract_id},
+            {"_id": 0, "status": 1, "progress": 1, "filename": 1, "upload_date": 1,
+             "updated_at": 1, "error": 1, "processing_completed_at": 1}
+        )
         
         if not contract:
             raise ContractNotFoundError(f"Contract {contract_id} not found")
@@ -130,12 +204,93 @@ def get_contract_status(contract_id: str):
     except ContractNotFoundError:
         raise HTTPException(status_code=404, detail=f"Contract {contract_id} not found")
     except Exception as e:
-        logger.error(f"Database error getting contract status: {str(e)}")
+        logger.error("Database error getting contract status: %s", e)
+        raise HTTPException(status_code=503, detail="Database service unavailable")
+
+
+# Statistics endpoint (bonus feature)
+# Declared before /contracts/{contract_id} so "stats" isn't captured as an id
+@router.get("/contracts/stats", response_model=Dict[str, Any])
+async def get_contract_statistics(request: Request):
+    """
+    Get contract processing statistics
+    
+    Results are cached in-process for STATS_CACHE_TTL seconds and carry an
+    ETag so polling clients can revalidate with If-None-Match.
+    
+    Returns:
+        Dictionary with various statistics
+    """
+    try:
+        if _stats_cache["payload"] is None or time.monotonic() >= _stats_cache["expires_at"]:
+            payload = await _compute_contract_statistics()
+            _stats_cache["payload"] = payload
+            # The ETag covers the counts only, so it survives recomputation
+            # until they actually change
+            counts = {key: value for key, value in payload.items() if key != "timestamp"}
+            _stats_cache["etag"] = '"%s"' % hashlib.md5(
+                orjson.dumps(counts, option=orjson.OPT_SORT_KEYS)
+            ).hexdigest()
+            _stats_cache["expires_at"] = time.monotonic() + STATS_CACHE_TTL
+        
+        headers = {
+            "ETag": _stats_cache["etag"],
+            "Cache-Control": f"max-age={STATS_CACHE_TTL}, public"
+        }
+        if _etag_matches(request, _stats_cache["etag"]):
+            return Response(status_code=304, headers=headers)
+        
+        return ORJSONResponse(content=_stats_cache["payload"], headers=headers)
+        
+    except Exception as e:
+        logger.error("Database error getting statistics: %s", e)
         raise HTTPException(status_code=503, detail="Database service unavailable")
 
 
+async def _compute_contract_statistics() -> Dict[str, Any]:
+    """Aggregate the statistics payload from the contracts collection"""
+    contracts = get_async_contracts_collection()
+    
+    # Status breakdown and completed-contract stats in a single pass
+    pipeline = [
+        {"$facet": {
+            "by_status": [
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ],
+            "completed": [
+                {"$match": {"status": "completed"}},
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "avg_score": {"$avg": "$score"}
+                }}
+            ]
+        }}
+    ]
+    
+    cursor = await contracts.aggregate(pipeline)
+    results = await cursor.to_list(length=1)
+    result = results[0] if results else {}
+    status_stats = result.get("by_status", [])
+    completed_stats = result.get("completed") or [{}]
+    
+    total_contracts = sum(stat["count"] for stat in status_stats)
+    completed_contracts = completed_stats[0].get("count", 0)
+    avg_score = completed_stats[0].get("avg_score")
+    avg_score = round(avg_score, 1) if avg_score is not None else 0
+    
+    return {
+        "total_contracts": total_contracts,
+        "completed_contracts": completed_contracts,
+        "completion_rate": round((completed_contracts / total_contracts * 100), 1) if total_contracts > 0 else 0,
+        "average_score": avg_score,
+        "status_breakdown": {stat["_id"]: stat["count"] for stat in status_stats},
+        "timestamp": get_current_timestamp()
+    }
+
+
 @router.get("/contracts/{contract_id}", response_model=Dict[str, Any])
-def get_contract_data(contract_id: str):
+async def get_contract_data(contract_id: str):
     """
     Get extracted data for a completed contract
     
@@ -149,8 +304,12 @@ def get_contract_data(contract_id: str):
         HTTPException: If contract not found or not ready
     """
     try:
-        contracts = get_contracts_collection()
-        contract = contracts.find_one({"contract_id": contract_id})
+        contracts = get_async_contracts_collection()
+        contract = await contracts.find_one(
+            {"_id": contract_id},
+            {"_id": 0, "filename": 1, "status": 1, "score": 1, "extracted_data": 1, "gaps": 1,
+             "confidence_scores": 1, "processing_completed_at": 1, "file_size": 1, "upload_date": 1}
+        )
         
         if not contract:
             raise ContractNotFoundError(f"Contract {contract_id} not found")
@@ -182,12 +341,12 @@ def get_contract_data(contract_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Database error getting contract data: {str(e)}")
+        logger.error("Database error getting contract data: %s", e)
         raise HTTPException(status_code=503, detail="Database service unavailable")
 
 
 @router.get("/contracts", response_model=Dict[str, Any])
-def list_contracts(
+async def list_contracts(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Number of contracts per page"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -208,8 +367,6 @@ def list_contracts(
         Dictionary with paginated contract list and metadata
     """
     try:
-        contracts = get_contracts_collection()
-        
         # Build query
         query = {}
         if status:
@@ -217,24 +374,43 @@ def list_contracts(
                 raise HTTPException(status_code=400, detail="Invalid status filter")
             query["status"] = status
         
-        # Count total documents
-        total_count = contracts.count_documents(query)
+        if sort_by not in SORTABLE_FIELDS:
+            raise HTTPException(status_code=400, detail="Invalid sort field")
+        
+        contracts = get_async_contracts_collection()
         
         # Calculate pagination
         skip = (page - 1) * limit
-        total_pages = (total_count + limit - 1) // limit
-        
-        # Build sort criteria
         sort_direction = 1 if sort_order == "asc" else -1
-        sort_criteria = [(sort_by, sort_direction)]
         
-        # Get contracts
-        cursor = contracts.find(query, {
-            "original_file": 0  # Exclude binary data from list
-        }).sort(sort_criteria).skip(skip).limit(limit)
+        # Fetch the page and the total count in a single aggregation; the
+        # $match + $sort prefix runs on the (status, sort field) indexes
+        pipeline = [
+            {"$match": query},
+            {"$sort": {sort_by: sort_direction}},
+            {"$facet": {
+                "page": [
+                    {"$skip": skip},
+                    {"$limit": limit},
+                    {"$project": {
+                        "_id": 0, "contract_id": 1, "filename": 1, "status": 1, "progress": 1,
+                        "score": 1, "upload_date": 1, "updated_at": 1, "file_size": 1, "error": 1,
+                        "gaps_count": {"$size": {"$ifNull": ["$gaps", []]}}
+                    }}
+                ],
+                "total": [{"$count": "n"}]
+            }}
+        ]
+        cursor = await contracts.aggregate(pipeline, allowDiskUse=False)
+        results = await cursor.to_list(length=1)
+        result = results[0] if results else {}
+        
+        total = result.get("total") or [{"n": 0}]
+        total_count = total[0]["n"]
+        total_pages = (total_count + limit - 1) // limit
         
         contract_list = []
-        for contract in cursor:
+        for contract in result.get("page", []):
             contract_summary = {
                 "contract_id": contract["contract_id"],
                 "filename": contract.get("filename"),
@@ -244,7 +420,7 @@ def list_contracts(
                 "upload_date": contract.get("upload_date"),
                 "updated_at": contract.get("updated_at"),
                 "file_size": contract.get("file_size"),
-                "gaps_count": len(contract.get("gaps", []))
+                "gaps_count": contract.get("gaps_count", 0)
             }
             
             # Add error for failed contracts
@@ -273,45 +449,97 @@ def list_contracts(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Database error listing contracts: {str(e)}")
+        logger.error("Database error listing contracts: %s", e)
         raise HTTPException(status_code=503, detail="Database service unavailable")
 
 
+async def _iter_file_chunks(grid_out: AsyncGridOut) -> AsyncIterator[bytes]:
+    """Yield a GridFS file chunk by chunk, closing it once exhausted"""
+    try:
+        while chunk := await grid_out.readchunk():
+            yield chunk
+    finally:
+        await grid_out.close()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+async def _find_downloadable_contract(contract_id: str) -> Dict[str, Any]:
+    """Fetch the fields needed to serve a contract's original file"""
+    contracts = get_async_contracts_collection()
+    contract = await contracts.find_one(
+        {"_id": contract_id},
+        {"_id": 0, "file_id": 1, "filename": 1, "file_size": 1, "etag": 1}
+    )
+    
+    if contract is None:
+        raise ContractNotFoundError(f"Contract {contract_id} not found")
+    
+    if not contract.get("file_id"):
+        raise HTTPException(status_code=404, detail="Original file not found")
+    
+    return contract
+
+
+def _download_headers(contract: Dict[str, Any], contract_id: str) -> Dict[str, str]:
+    """Build the response headers describing a contract's original file"""
+    filename = contract.get("filename", f"{contract_id}.pdf")
+    headers = {"Content-Disposition": f"attachment; filename=\"{filename}\""}
+    if contract.get("etag"):
+        headers["ETag"] = f'"{contract["etag"]}"'
+    if contract.get("file_size") is not None:
+        headers["Content-Length"] = str(contract["file_size"])
+    return headers
+
+
+def _download_not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """Build a 304 response if the client's copy of the file is current"""
+    if "ETag" in headers and _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers={"ETag": headers["ETag"]})
+    return None
+
+
 @router.get("/contracts/{contract_id}/download")
-def download_contract(contract_id: str):
+async def download_contract(contract_id: str, request: Request):
     """
     Download original contract file
     
     Args:
         contract_id: Unique contract identifier
+        request: Incoming request (checked for If-None-Match)
         
     Returns:
-        StreamingResponse with PDF file
+        StreamingResponse with PDF file, or 304 if the client copy is current
         
     Raises:
         HTTPException: If contract not found
     """
     try:
-        contracts = get_contracts_collection()
-        contract = contracts.find_one({"contract_id": contract_id})
+        contract = await _find_downloadable_contract(contract_id)
+        headers = _download_headers(contract, contract_id)
         
-        if not contract:
-            raise ContractNotFoundError(f"Contract {contract_id} not found")
+        not_modified = _download_not_modified(request, headers)
+        if not_modified is not None:
+            return not_modified
         
-        if "original_file" not in contract:
+        # Stream the file straight out of GridFS
+        try:
+            grid_out = await get_async_files_bucket().open_download_stream(contract["file_id"])
+        except NoFile:
             raise HTTPException(status_code=404, detail="Original file not found")
-        
-        # Create file stream
-        file_stream = BytesIO(contract["original_file"])
-        filename = contract.get("filename", f"{contract_id}.pdf")
+        headers["Content-Length"] = str(grid_out.length)
         
         return StreamingResponse(
-            BytesIO(contract["original_file"]),
+            _iter_file_chunks(grid_out),
             media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=\"{filename}\"",
-                "Content-Length": str(len(contract["original_file"]))
-            }
+            headers=headers
         )
         
     except ContractNotFoundError:
@@ -319,12 +547,46 @@ def download_contract(contract_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Database error downloading contract: {str(e)}")
+        logger.error("Database error downloading contract: %s", e)
+        raise HTTPException(status_code=503, detail="Database service unavailable")
+
+
+@router.head("/contracts/{contract_id}/download")
+async def head_contract_download(contract_id: str, request: Request):
+    """
+    Describe the original contract file without sending it
+    
+    Args:
+        contract_id: Unique contract identifier
+        request: Incoming request (checked for If-None-Match)
+        
+    Returns:
+        Empty response carrying the download headers, or 304 if the client copy is current
+        
+    Raises:
+        HTTPException: If contract not found
+    """
+    try:
+        contract = await _find_downloadable_contract(contract_id)
+        headers = _download_headers(contract, contract_id)
+        
+        not_modified = _download_not_modified(request, headers)
+        if not_modified is not None:
+            return not_modified
+        
+        return Response(media_type="application/pdf", headers=headers)
+        
+    except ContractNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Contract {contract_id} not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Database error describing contract download: %s", e)
         raise HTTPException(status_code=503, detail="Database service unavailable")
 
 
 @router.delete("/contracts/{contract_id}")
-def delete_contract(contract_id: str):
+async def delete_contract(contract_id: str):
     """
     Delete a contract and its data
     
@@ -338,13 +600,24 @@ def delete_contract(contract_id: str):
         HTTPException: If contract not found
     """
     try:
-        contracts = get_contracts_collection()
-        result = contracts.delete_one({"contract_id": contract_id})
+        contracts = get_async_contracts_collection()
+        contract = await contracts.find_one_and_delete(
+            {"_id": contract_id}, projection={"file_id": 1}
+        )
         
-        if result.deleted_count == 0:
+        if contract is None:
             raise ContractNotFoundError(f"Contract {contract_id} not found")
         
-        logger.info(f"Deleted contract {contract_id}")
+        _invalidate_stats_cache()
+        
+        # Remove the original PDF from GridFS
+        if contract.get("file_id"):
+            try:
+                await get_async_files_bucket().delete(contract["file_id"])
+            except NoFile:
+                logger.warning("Original file for contract %s already removed", contract_id)
+        
+        logger.info("Deleted contract %s", contract_id)
         
         return {
             "message": f"Contract {contract_id} deleted successfully",
@@ -354,7 +627,7 @@ def delete_contract(contract_id: str):
     except ContractNotFoundError:
         raise HTTPException(status_code=404, detail=f"Contract {contract_id} not found")
     except Exception as e:
-        logger.error(f"Database error deleting contract: {str(e)}")
+        logger.error("Database error deleting contract: %s", e)
         raise HTTPException(status_code=503, detail="Database service unavailable")
 
 
@@ -366,53 +639,3 @@ def health_check():
         "service": "contract-intelligence-parser",
         "timestamp": get_current_timestamp()
     }
-
-
-# Statistics endpoint (bonus feature)
-@router.get("/contracts/stats", response_model=Dict[str, Any])
-def get_contract_statistics():
-    """
-    Get contract processing statistics
-    
-    Returns:
-        Dictionary with various statistics
-    """
-    try:
-        contracts = get_contracts_collection()
-        
-        # Count by status
-        pipeline = [
-            {"$group": {
-                "_id": "$status",
-                "count": {"$sum": 1},
-                "avg_score": {"$avg": "$score"}
-            }}
-        ]
-        
-        status_stats = list(contracts.aggregate(pipeline))
-        
-        # Overall stats
-        total_contracts = contracts.count_documents({})
-        completed_contracts = contracts.count_documents({"status": "completed"})
-        
-        # Average score for completed contracts
-        avg_score_pipeline = [
-            {"$match": {"status": "completed", "score": {"$exists": True}}},
-            {"$group": {"_id": None, "avg_score": {"$avg": "$score"}}}
-        ]
-        
-        avg_score_result = list(contracts.aggregate(avg_score_pipeline))
-        avg_score = round(avg_score_result[0]["avg_score"], 1) if avg_score_result else 0
-        
-        return {
-            "total_contracts": total_contracts,
-            "completed_contracts": completed_contracts,
-            "completion_rate": round((completed_contracts / total_contracts * 100), 1) if total_contracts > 0 else 0,
-            "average_score": avg_score,
-            "status_breakdown": {stat["_id"]: stat["count"] for stat in status_stats},
-            "timestamp": get_current_timestamp()
-        }
-        
-    except Exception as e:
-        logger.error(f"Database error getting statistics: {str(e)}")
-        raise HTTPException(status_code=503, detail="Database service unavailable")
@@ -1,6 +1,8 @@
 """Configuration settings for the application"""
 
 import os
+import sys
+from enum import IntEnum
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,6 +10,12 @@ load_dotenv()
 
 # MongoDB Configuration
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/contract_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 200))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 10))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+# Wire compressors in order of preference; ones whose library isn't installed are skipped
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+MONGO_APP_NAME = os.getenv("MONGO_APP_NAME", "contract-parser")
 
 # Redis Configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -19,10 +27,26 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 # Celery Configuration
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+# Parsing is CPU-bound, so workers run one process per CPU; Windows can't fork,
+# so it falls back to threads there
+CELERY_WORKER_POOL = os.getenv("CELERY_WORKER_POOL", "threads" if sys.platform == "win32" else "prefork")
+CELERY_WORKER_CONCURRENCY = int(os.getenv("CELERY_WORKER_CONCURRENCY", os.cpu_count() or 1))
 
 # Application Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 52428800))  # 50MB in bytes
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1048576))  # 1MB in bytes
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", 5))  # seconds
+# Failed contracts (and their PDFs) are deleted by cleanup_old_results this many days after creation
+FAILED_CONTRACT_RETENTION_DAYS = int(os.getenv("FAILED_CONTRACT_RETENTION_DAYS", 30))
+# Local processes used to parse contracts when the Celery broker is unreachable
+EXTRACTOR_POOL_SIZE = int(os.getenv("EXTRACTOR_POOL_SIZE", os.cpu_count() or 1))
+# PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split across
+# PDF_PAGE_WORKERS processes for text extraction; smaller ones aren't worth the overhead
+PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", os.cpu_count() or 1))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 64))
+# Only the first MAX_PAGES_PROCESS pages of a PDF are parsed for text; 0 parses every page
+MAX_PAGES_PROCESS = int(os.getenv("MAX_PAGES_PROCESS", 0))
 
 # API Configuration
 API_V1_STR = "/api/v1"
@@ -42,3 +66,22 @@ SCORING_WEIGHTS = {
     "sla_definition": 15,
     "contact_information": 10,
 }
+
+
+class ScoreCategory(IntEnum):
+    """Scoring categories, in the order of SCORING_CAPS"""
+    FINANCIAL = 0
+    PARTIES = 1
+    PAYMENT = 2
+    SLA = 3
+    CONTACT = 4
+
+
+# SCORING_WEIGHTS as a tuple indexed by ScoreCategory
+SCORING_CAPS = (
+    SCORING_WEIGHTS["financial_completeness"],
+    SCORING_WEIGHTS["party_identification"],
+    SCORING_WEIGHTS["payment_terms_clarity"],
+    SCORING_WEIGHTS["sla_definition"],
+    SCORING_WEIGHTS["contact_information"],
+)
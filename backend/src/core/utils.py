@@ -1,9 +1,165 @@
 """Core utility functions for scoring and gap analysis"""
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple, BinaryIO, Union
+import os
 import re
-from datetime import datetime
-from src.core.config import SCORING_WEIGHTS
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from uuid import uuid4
+from src.core.config import SCORING_CAPS, ScoreCategory
+from src.core.exceptions import FileValidationError
+
+
+# (section, ((field, points), ...), category): points are awarded for each
+# truthy field of the section; parties are scored separately
+_SCORE_RULES = (
+    ("financial_details", (("total_value", 10), ("line_items", 10), ("currency", 5), ("tax_information", 5)), ScoreCategory.FINANCIAL),
+    ("payment_structure", (("terms", 8), ("schedule", 6), ("method", 6)), ScoreCategory.PAYMENT),
+    ("sla_terms", (("response_time", 5), ("uptime_guarantee", 5), ("penalties", 5)), ScoreCategory.SLA),
+    ("contact_information", (("billing_contact", 5), ("technical_contact", 5)), ScoreCategory.CONTACT),
+)
+
+# Gap templates; analyze_contract returns copies, so callers may modify them
+_GAP_NO_FINANCIAL_DETAILS = {
+    "field": "Financial Details",
+    "importance": "High",
+    "status": "Missing",
+    "description": "No financial information found"
+}
+_GAP_NO_CONTRACT_VALUE = {
+    "field": "Contract Value",
+    "importance": "High",
+    "status": "Missing",
+    "description": "Total contract value not specified"
+}
+_GAP_NO_CURRENCY = {
+    "field": "Currency",
+    "importance": "Medium",
+    "status": "Missing",
+    "description": "Currency not specified"
+}
+_GAP_FEW_PARTIES = {
+    "field": "Contract Parties",
+    "importance": "High",
+    "status": "Incomplete",
+    "description": "Less than 2 parties identified"
+}
+_GAP_NO_PAYMENT_TERMS = {
+    "field": "Payment Terms",
+    "importance": "High",
+    "status": "Missing",
+    "description": "Payment terms not found"
+}
+_GAP_NO_PAYMENT_SCHEDULE = {
+    "field": "Payment Schedule",
+    "importance": "High",
+    "status": "Missing",
+    "description": "Payment schedule not specified"
+}
+_GAP_NO_SLA = {
+    "field": "Service Level Agreements",
+    "importance": "Medium",
+    "status": "Missing",
+    "description": "SLA terms not found"
+}
+_GAP_NO_CONTACT = {
+    "field": "Contact Information",
+    "importance": "Medium",
+    "status": "Missing",
+    "description": "Contact details not found"
+}
+
+# Gaps reported when nothing at all was extracted
+_DEFAULT_ALL_GAPS = (
+    _GAP_NO_FINANCIAL_DETAILS,
+    _GAP_FEW_PARTIES,
+    _GAP_NO_PAYMENT_TERMS,
+    _GAP_NO_SLA,
+    _GAP_NO_CONTACT,
+)
+
+
+
+def analyze_contract(extracted_data: Dict[str, Any]) -> Tuple[int, List[Dict[str, str]]]:
+    """
+    Score a contract and identify its gaps in a single pass over the extracted data
+    
+    Args:
+        extracted_data: Dictionary containing extracted contract data
+        
+    Returns:
+        Tuple of (score from 0-100, list of gaps with field name, importance, and status)
+    """
+    if not extracted_data:
+        return 0, [dict(gap) for gap in _DEFAULT_ALL_GAPS]
+    
+    get = extracted_data.get
+    category_scores = [0] * len(ScoreCategory)
+    gaps = []
+    
+    # Each section is looked up once and shared by the scoring and gap checks
+    sections = [get(section_key) for section_key, _, _ in _SCORE_RULES]
+    financial, payment, sla, contact = sections
+    for section, (_, fields, category) in zip(sections, _SCORE_RULES):
+        if section:
+            section_get = section.get
+            category_score = 0
+            for field, points in fields:
+                if section_get(field):
+                    category_score += points
+            category_scores[category] = category_score
+    
+    # Party identification needs at least two parties
+    parties = get("parties")
+    has_parties = bool(parties) and len(parties) >= 2
+    if has_parties:
+        # One walk finds both flags, stopping as soon as both are set
+        has_legal = has_signatory = False
+        for party in parties:
+            has_legal = has_legal or bool(party.get("legal_entity"))
+            has_signatory = has_signatory or bool(party.get("authorized_signatory"))
+            if has_legal and has_signatory:
+                break
+        party_score = 15
+        if has_legal:
+            party_score += 5
+        if has_signatory:
+            party_score += 5
+        category_scores[ScoreCategory.PARTIES] = party_score
+    
+    score = 0
+    for category_score, cap in zip(category_scores, SCORING_CAPS):
+        score += min(category_score, cap)
+    
+    # Critical financial information
+    if not financial:
+        gaps.append(dict(_GAP_NO_FINANCIAL_DETAILS))
+    else:
+        if not financial.get("total_value"):
+            gaps.append(dict(_GAP_NO_CONTRACT_VALUE))
+        if not financial.get("currency"):
+            gaps.append(dict(_GAP_NO_CURRENCY))
+    
+    # Party information
+    if not has_parties:
+        gaps.append(dict(_GAP_FEW_PARTIES))
+    
+    # Payment terms
+    if not payment:
+        gaps.append(dict(_GAP_NO_PAYMENT_TERMS))
+    elif not payment.get("terms"):
+        gaps.append(dict(_GAP_NO_PAYMENT_SCHEDULE))
+    
+    # SLA terms
+    if not sla:
+        gaps.append(dict(_GAP_NO_SLA))
+    
+    # Contact information
+    if not contact:
+        gaps.append(dict(_GAP_NO_CONTACT))
+    
+    return min(score, 100), gaps
 
 
 def calculate_score(extracted_data: Dict[str, Any]) -> int:
@@ -16,162 +172,133 @@ def calculate_score(extracted_data: Dict[str, Any]) -> int:
     Returns:
         Score from 0-100
     """
-    score = 0
+    return analyze_contract(extracted_data)[0]
+
+
+def identify_gaps(extracted_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Identify missing or incomplete critical fields in contract data
     
-    # Financial completeness (30 points)
-    if extracted_data.get("financial_details"):
-        financial = extracted_data["financial_details"]
-        financial_score = 0
+    Args:
+        extracted_data: Dictionary containing extracted contract data
         
-        if financial.get("total_value"):
-            financial_score += 10
-        if financial.get("line_items") and len(financial["line_items"]) > 0:
-            financial_score += 10
-        if financial.get("currency"):
-            financial_score += 5
-        if financial.get("tax_information"):
-            financial_score += 5
-            
-        score += min(financial_score, SCORING_WEIGHTS["financial_completeness"])
-    
-    # Party identification (25 points)
-    if extracted_data.get("parties"):
-        parties = extracted_data["parties"]
-        if len(parties) >= 2:  # At least two parties
-            party_score = 15
-            if any(p.get("legal_entity") for p in parties):
-                party_score += 5
-            if any(p.get("authorized_signatory") for p in parties):
-                party_score += 5
-            score += min(party_score, SCORING_WEIGHTS["party_identification"])
-    
-    # Payment terms clarity (20 points)
-    if extracted_data.get("payment_structure"):
-        payment = extracted_data["payment_structure"]
-        payment_score = 0
+    Returns:
+        List of gaps with field name, importance, and status
+    """
+    return analyze_contract(extracted_data)[1]
+
+
+def validate_filename(filename: str) -> bool:
+    """
+    Validate the name of an uploaded file
+    
+    Args:
+        filename: Original filename
         
-        if payment.get("terms"):
-            payment_score += 8
-        if payment.get("schedule"):
-            payment_score += 6
-        if payment.get("method"):
-            payment_score += 6
-            
-        score += min(payment_score, SCORING_WEIGHTS["payment_terms_clarity"])
-    
-    # SLA definition (15 points)
-    if extracted_data.get("sla_terms"):
-        sla = extracted_data["sla_terms"]
-        sla_score = 0
+    Returns:
+        True if the filename is acceptable
         
-        if sla.get("response_time"):
-            sla_score += 5
-        if sla.get("uptime_guarantee"):
-            sla_score += 5
-        if sla.get("penalties"):
-            sla_score += 5
-            
-        score += min(sla_score, SCORING_WEIGHTS["sla_definition"])
-    
-    # Contact information (10 points)
-    if extracted_data.get("contact_information"):
-        contact = extracted_data["contact_information"]
-        contact_score = 0
+    Raises:
+        FileValidationError: If the file is not a PDF
+    """
+    if not filename.lower().endswith('.pdf'):
+        raise FileValidationError("Only PDF files are supported")
+    
+    return True
+
+
+def validate_file_size(size: int, max_size: int) -> bool:
+    """
+    Validate the (running) size of an uploaded file
+    
+    Args:
+        size: Number of bytes received so far
+        max_size: Maximum allowed file size in bytes
+        
+    Returns:
+        True if the size is within the limit
         
-        if contact.get("billing_contact"):
-            contact_score += 5
-        if contact.get("technical_contact"):
-            contact_score += 5
-            
-        score += min(contact_score, SCORING_WEIGHTS["contact_information"])
+    Raises:
+        FileValidationError: If the size exceeds the limit
+    """
+    if size > max_size:
+        raise FileValidationError(f"File size exceeds maximum limit of {max_size / 1024 / 1024:.1f} MB")
     
-    return min(score, 100)
+    return True
 
 
-def identify_gaps(extracted_data: Dict[str, Any]) -> List[Dict[str, str]]:
+def validate_file_header(header: bytes) -> bool:
     """
-    Identify missing or incomplete critical fields in contract data
+    Validate the leading bytes of an uploaded file
     
     Args:
-        extracted_data: Dictionary containing extracted contract data
+        header: First bytes of the file (an empty value means an empty file)
         
     Returns:
-        List of gaps with field name, importance, and status
+        True if the header looks like a PDF
+        
+    Raises:
+        FileValidationError: If the file is empty or not a PDF
     """
-    gaps = []
+    # Check if file has content
+    if len(header) == 0:
+        raise FileValidationError("File is empty")
     
-    # Critical financial information
-    if not extracted_data.get("financial_details"):
-        gaps.append({
-            "field": "Financial Details",
-            "importance": "High",
-            "status": "Missing",
-            "description": "No financial information found"
-        })
-    else:
-        financial = extracted_data["financial_details"]
-        if not financial.get("total_value"):
-            gaps.append({
-                "field": "Contract Value",
-                "importance": "High",
-                "status": "Missing",
-                "description": "Total contract value not specified"
-            })
-        if not financial.get("currency"):
-            gaps.append({
-                "field": "Currency",
-                "importance": "Medium",
-                "status": "Missing",
-                "description": "Currency not specified"
-            })
+    # PDF magic bytes
+    if not header.startswith(b'%PDF-'):
+        raise FileValidationError("File is not a valid PDF")
     
-    # Party information
-    parties = extracted_data.get("parties", [])
-    if len(parties) < 2:
-        gaps.append({
-            "field": "Contract Parties",
-            "importance": "High",
-            "status": "Incomplete",
-            "description": "Less than 2 parties identified"
-        })
+    return True
+
+
+def validate_upload(filename: str, header: bytes, size: int, max_size: int) -> bool:
+    """
+    Validate an upload from its name, leading bytes and size
     
-    # Payment terms
-    if not extracted_data.get("payment_structure"):
-        gaps.append({
-            "field": "Payment Terms",
-            "importance": "High",
-            "status": "Missing",
-            "description": "Payment terms not found"
-        })
-    else:
-        payment = extracted_data["payment_structure"]
-        if not payment.get("terms"):
-            gaps.append({
-                "field": "Payment Schedule",
-                "importance": "High",
-                "status": "Missing",
-                "description": "Payment schedule not specified"
-            })
+    Args:
+        filename: Original filename
+        header: First bytes of the file (an empty value means an empty file)
+        size: Number of bytes received so far
+        max_size: Maximum allowed file size in bytes
+        
+    Returns:
+        True if the upload is acceptable so far
+        
+    Raises:
+        FileValidationError: If the upload is invalid
+    """
+    validate_filename(filename)
+    validate_file_size(size, max_size)
+    validate_file_header(header)
     
-    # SLA terms
-    if not extracted_data.get("sla_terms"):
-        gaps.append({
-            "field": "Service Level Agreements",
-            "importance": "Medium",
-            "status": "Missing",
-            "description": "SLA terms not found"
-        })
+    return True
+
+
+def validate_file_stream(fp: BinaryIO, filename: str, max_size: int) -> int:
+    """
+    Validate an uploaded file without reading its whole body
     
-    # Contact information
-    if not extracted_data.get("contact_information"):
-        gaps.append({
-            "field": "Contact Information",
-            "importance": "Medium",
-            "status": "Missing",
-            "description": "Contact details not found"
-        })
+    Only the first kilobyte is read for the PDF header; the size comes from
+    seeking to the end. The stream is rewound before returning.
     
-    return gaps
+    Args:
+        fp: Seekable binary file object (e.g. an UploadFile's spooled file)
+        filename: Original filename
+        max_size: Maximum allowed file size in bytes
+        
+    Returns:
+        Size of the file in bytes
+        
+    Raises:
+        FileValidationError: If file is invalid
+    """
+    fp.seek(0)
+    header = fp.read(1024)
+    size = fp.seek(0, os.SEEK_END)
+    fp.seek(0)
+    
+    validate_upload(filename, header, size, max_size)
+    return size
 
 
 def validate_file(file_data: bytes, filename: str, max_size: int) -> bool:
@@ -189,51 +316,122 @@ def validate_file(file_data: bytes, filename: str, max_size: int) -> bool:
     Raises:
         FileValidationError: If file is invalid
     """
-    from src.core.exceptions import FileValidationError
-    
-    # Check file extension
-    if not filename.lower().endswith('.pdf'):
-        raise FileValidationError("Only PDF files are supported")
-    
-    # Check file size
-    if len(file_data) > max_size:
-        raise FileValidationError(f"File size exceeds maximum limit of {max_size / 1024 / 1024:.1f} MB")
-    
-    # Check if file has content
-    if len(file_data) == 0:
-        raise FileValidationError("File is empty")
-    
-    # Basic PDF header check
-    if not file_data.startswith(b'%PDF'):
-        raise FileValidationError("File is not a valid PDF")
-    
-    return True
+    return validate_upload(filename, file_data[:1024], len(file_data), max_size)
 
 
 def generate_contract_id() -> str:
-    """Generate a unique contract ID"""
-    from uuid import uuid4
-    return str(uuid4())
+    """Generate a unique contract ID (32 hex characters, no hyphens)"""
+    return uuid4().hex
+
+
+# (epoch second, ISO string) of the last formatted timestamp
+_timestamp_cache = (0, "")
+
+
+def _format_second(second: int) -> str:
+    """Format an epoch second as an ISO timestamp, reusing the last result"""
+    global _timestamp_cache
+    cached_second, timestamp = _timestamp_cache
+    if second != cached_second:
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, timestamp)
+    return timestamp
 
 
 def get_current_timestamp() -> str:
-    """Get current timestamp in ISO format"""
-    return datetime.utcnow().isoformat()
+    """Get current timestamp in ISO format, at one-second resolution"""
+    return _format_second(int(time.time()))
+
 
+def get_current_timestamp_precise() -> str:
+    """Get current timestamp in ISO format, with microseconds"""
+    now = time.time()
+    second = int(now)
+    return f"{_format_second(second)}.{int((now - second) * 1_000_000):06d}"
 
-def extract_confidence_score(text: str, pattern: str, field_name: str) -> Dict[str, Any]:
+
+def get_current_datetime() -> datetime:
+    """Get current UTC time as a datetime (stored as a native BSON date)"""
+    return datetime.now(timezone.utc)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    """Compile a regex once and reuse it across calls"""
+    return re.compile(pattern, flags)
+
+
+def context_window(text: str, needle: str, width: int) -> Optional[str]:
+    """
+    Return the first occurrence of needle with up to width characters either side
+    
+    Matches what re.search(".{0,width}" + re.escape(needle) + ".{0,width}")
+    returns, including not crossing line breaks, without the regex engine
+    trying every start position.
+    
+    Args:
+        text: Text to search in
+        needle: Literal to look for
+        width: Maximum context on each side
+        
+    Returns:
+        The context window, or None if needle doesn't occur
+    """
+    idx = text.find(needle)
+    if idx < 0:
+        return None
+    start = max(text.rfind("\n", 0, idx) + 1, idx - width)
+    line_end = text.find("\n", start)
+    if line_end < 0:
+        line_end = len(text)
+    # The greedy lead-in settles on the last occurrence it can reach
+    idx = text.rfind(needle, start, min(start + width, line_end) + len(needle))
+    end = idx + len(needle)
+    stop = text.find("\n", end)
+    if stop < 0:
+        stop = len(text)
+    return text[start:min(stop, end + width)]
+
+
+def _findall_at_spans(pattern: "re.Pattern[str]", searched: str, text: str) -> List[Any]:
+    """pattern.findall(searched), with each value sliced from text at the same span"""
+    if pattern.groups == 0:
+        return [text[match.start():match.end()] for match in pattern.finditer(searched)]
+    if pattern.groups == 1:
+        # A group that didn't take part has span (-1, -1), which slices to ""
+        return [text[match.start(1):match.end(1)] for match in pattern.finditer(searched)]
+    groups = range(1, pattern.groups + 1)
+    return [tuple(text[match.start(group):match.end(group)] for group in groups)
+            for match in pattern.finditer(searched)]
+
+
+def extract_confidence_score(text: str, pattern: Union[str, "re.Pattern[str]"], field_name: str,
+                             text_lower: Optional[str] = None,
+                             search_lower: bool = False) -> Dict[str, Any]:
     """
     Extract data with confidence scoring based on pattern match strength
     
     Args:
         text: Text to search in
-        pattern: Regex pattern
+        pattern: Regex pattern string, or a pattern precompiled with
+            re.IGNORECASE | re.MULTILINE
         field_name: Name of the field being extracted
+        text_lower: text.lower(), when the caller already has it
+        search_lower: pattern is a lowercase, case-sensitive pattern to run
+            over text_lower instead; values are still taken from text. The
+            caller must make sure text_lower lines up with text
         
     Returns:
         Dictionary with extracted value and confidence score
     """
-    matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
+    if isinstance(pattern, str):
+        pattern = _compile(pattern, re.IGNORECASE | re.MULTILINE)
+    if search_lower:
+        if text_lower is None:
+            text_lower = text.lower()
+        matches = _findall_at_spans(pattern, text_lower, text)
+    else:
+        matches = pattern.findall(text)
     
     if not matches:
         return {"value": None, "confidence": 0}
@@ -246,9 +444,11 @@ def extract_confidence_score(text: str, pattern: str, field_name: str) -> Dict[s
     confidence = min(85 + len(matches) * 5, 95)  # Base confidence with boost for multiple matches
     
     if len(matches) == 1:
-        # Single match - check context
-        match_context = re.search(f".{{0,50}}{re.escape(matches[0])}.{{0,50}}", text, re.IGNORECASE)
-        if match_context and field_name.lower() in match_context.group().lower():
+        # Single match - check context around the value's first occurrence
+        if text_lower is None:
+            text_lower = text.lower()
+        match_context = context_window(text_lower, matches[0].lower(), 50)
+        if match_context and field_name.lower() in match_context:
             confidence += 10
     
     return {
@@ -0,0 +1,105 @@
+"""One-off data migrations for the contracts collection
+
+Run from the backend directory with `python scripts.py migrate`.
+"""
+
+from typing import Dict, Optional
+import hashlib
+import logging
+from gridfs import GridFSBucket
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+from src.database.models import get_contracts_collection, get_files_bucket
+
+logger = logging.getLogger(__name__)
+
+# Timestamps that used to be stored as ISO strings (UTC, no offset)
+DATETIME_FIELDS = ("upload_date", "created_at", "updated_at", "processing_completed_at")
+
+def migrate_contract_ids(contracts: Optional[Collection] = None) -> int:
+    """Re-key legacy contracts so that _id is the contract id
+    
+    Contracts used to get a generated ObjectId _id, but every single-contract
+    lookup now filters on {"_id": contract_id}. _id is immutable, so each
+    legacy document is reinserted under its contract_id and the original
+    removed. A copy left by an interrupted run is kept, so it is safe to rerun.
+    
+    Returns:
+        Number of documents re-keyed
+    """
+    contracts = contracts if contracts is not None else get_contracts_collection()
+    rekeyed = 0
+    for contract in contracts.find({"_id": {"$type": "objectId"}, "contract_id": {"$type": "string"}}):
+        legacy_id = contract["_id"]
+        contract["_id"] = contract["contract_id"]
+        try:
+            contracts.insert_one(contract)
+        except DuplicateKeyError:
+            logger.info("Contract %s was already re-keyed", contract["contract_id"])
+        contracts.delete_one({"_id": legacy_id})
+        rekeyed += 1
+    logger.info("Re-keyed %s legacy contracts", rekeyed)
+    return rekeyed
+
+def migrate_inline_files(contracts: Optional[Collection] = None,
+                         files: Optional[GridFSBucket] = None) -> int:
+    """Move PDFs stored inline in original_file into the contract_files bucket
+    
+    Downloads and parse_contract only read the GridFS file named by file_id,
+    so contracts that still carry their bytes inline could be neither
+    downloaded nor reparsed. Each PDF is uploaded, file_id and etag are set
+    and original_file is unset in one update.
+    
+    Returns:
+        Number of contracts migrated
+    """
+    contracts = contracts if contracts is not None else get_contracts_collection()
+    files = files if files is not None else get_files_bucket()
+    moved = 0
+    for contract in contracts.find({"original_file": {"$exists": True}},
+                                   projection={"original_file": 1, "filename": 1, "contract_id": 1}):
+        data = contract["original_file"]
+        file_id = files.upload_from_stream(
+            contract.get("filename") or f"{contract['contract_id']}.pdf", data
+        )
+        try:
+            contracts.update_one(
+                {"_id": contract["_id"]},
+                {"$set": {"file_id": file_id, "etag": hashlib.sha1(data).hexdigest()},
+                 "$unset": {"original_file": ""}}
+            )
+        except Exception:
+            # Don't leave an unreferenced copy behind
+            files.delete(file_id)
+            raise
+        moved += 1
+    logger.info("Moved %s inline PDFs to GridFS", moved)
+    return moved
+
+def migrate_string_dates(contracts: Optional[Collection] = None) -> Dict[str, int]:
+    """Convert ISO string timestamps to native BSON dates
+    
+    Documents written before timestamps were stored as dates sort apart
+    from newer ones and never match datetime range queries such as
+    cleanup_old_results' cutoff. The conversion runs server-side and only
+    touches fields that are still strings, so it is safe to rerun.
+    
+    Returns:
+        Number of documents converted per field
+    """
+    contracts = contracts if contracts is not None else get_contracts_collection()
+    converted = {}
+    for field in DATETIME_FIELDS:
+        result = contracts.update_many(
+            {field: {"$type": "string"}},
+            [{"$set": {field: {"$dateFromString": {"dateString": f"${field}", "timezone": "UTC"}}}}]
+        )
+        converted[field] = result.modified_count
+        logger.info("Converted %s %s values to dates", result.modified_count, field)
+    return converted
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_contract_ids()
+    migrate_inline_files()
+    migrate_string_dates()
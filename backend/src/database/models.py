@@ -1,14 +1,63 @@
 """Database models and connection management"""
 
-from pymongo import MongoClient
+from pymongo import MongoClient, AsyncMongoClient, ASCENDING, DESCENDING
 from pymongo.database import Database
 from pymongo.collection import Collection
-from typing import Optional
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from gridfs import GridFSBucket, AsyncGridFSBucket
+from bson import ObjectId
+from typing import Dict, List, Optional
+from datetime import datetime
+import importlib.util
 import logging
-from src.core.config import MONGO_URI
+import threading
+from src.core.config import (
+    MONGO_URI, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_COMPRESSORS, MONGO_APP_NAME
+)
 
 logger = logging.getLogger(__name__)
 
+# Python modules backing the optional wire compressors
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy"}
+
+def available_compressors(compressors: str) -> List[str]:
+    """Filter a comma-separated compressor list down to the ones usable here"""
+    available = []
+    for name in compressors.split(","):
+        name = name.strip()
+        module = _COMPRESSOR_MODULES.get(name)
+        if name and (module is None or importlib.util.find_spec(module) is not None):
+            available.append(name)
+    return available
+
+# Client options shared by the sync and async clients
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    "minPoolSize": MONGO_MIN_POOL_SIZE,
+    "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    "compressors": available_compressors(MONGO_COMPRESSORS),
+    "retryWrites": True,
+    "w": "majority",
+    "uuidRepresentation": "standard",
+    "appname": MONGO_APP_NAME,
+}
+
+# Indexes backing the list endpoint's filter+sort; single-contract lookups
+# use the _id index, since _id is the contract id
+CONTRACT_INDEXES = [
+    ([("status", ASCENDING), ("upload_date", DESCENDING)], {}),
+    ([("status", ASCENDING), ("updated_at", DESCENDING)], {}),
+    ([("upload_date", DESCENDING)], {}),
+    ([("updated_at", DESCENDING)], {}),
+]
+
+# Indexes older versions created that must not survive. The failed-contract
+# TTL index deleted contract documents without their GridFS files, so
+# cleanup_old_results does that sweep instead
+OBSOLETE_CONTRACT_INDEXES = ["created_at_1"]
+
 class MongoDB:
     """MongoDB connection manager"""
     
@@ -16,63 +65,177 @@ class MongoDB:
         self.uri = uri
         self.client: Optional[MongoClient] = None
         self.db: Optional[Database] = None
+        # Handles are built once per connection and reused by every task
+        self._collections: Dict[str, Collection] = {}
+        self._buckets: Dict[str, GridFSBucket] = {}
+        # Serializes connect() so concurrent callers share a single client
+        self._connect_lock = threading.Lock()
         
     def connect(self) -> Optional[Database]:
-        """Connect to MongoDB"""
+        """Connect to MongoDB, reusing the existing connection if there is one"""
+        with self._connect_lock:
+            if self.db is not None:
+                return self.db
+            self._clear_handles()
+            client = None
+            try:
+                client = MongoClient(self.uri, **MONGO_CLIENT_OPTIONS)
+                # Test the connection with shorter timeout
+                client.admin.command('ping')
+                self.client = client
+                self.db = client.get_default_database()
+                logger.info("Connected to MongoDB successfully")
+                self._ensure_indexes()
+                return self.db
+            except Exception as e:
+                logger.warning("MongoDB connection failed: %s", e)
+                logger.info("Starting without MongoDB - some features will be unavailable")
+                # Don't raise exception, allow app to start
+                if client is not None:
+                    client.close()
+                self.db = None
+                return None
+            
+    def _ensure_indexes(self):
+        """Create the contract indexes if they don't exist yet"""
         try:
-            self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
-            # Test the connection with shorter timeout
-            self.client.admin.command('ping')
-            self.db = self.client.get_default_database()
-            logger.info("Connected to MongoDB successfully")
-            return self.db
+            contracts = self.db["contracts"]
+            for keys, options in CONTRACT_INDEXES:
+                contracts.create_index(keys, **options)
+            existing = contracts.index_information()
+            for name in OBSOLETE_CONTRACT_INDEXES:
+                if name in existing:
+                    contracts.drop_index(name)
         except Exception as e:
-            logger.warning(f"MongoDB connection failed: {e}")
-            logger.info("Starting without MongoDB - some features will be unavailable")
-            # Don't raise exception, allow app to start
-            self.db = None
-            return None
+            logger.warning("Failed to create contract indexes: %s", e)
+            
+    def _clear_handles(self):
+        """Drop cached collection and bucket handles"""
+        self._collections.clear()
+        self._buckets.clear()
             
     def disconnect(self):
         """Disconnect from MongoDB"""
+        self._clear_handles()
         if self.client:
             self.client.close()
             logger.info("Disconnected from MongoDB")
+        # The next get_collection/get_bucket reconnects
+        self.db = None
     
     def get_collection(self, collection_name: str) -> Collection:
         """Get a collection from the database"""
+        collection = self._collections.get(collection_name)
+        if collection is not None:
+            return collection
         if self.db is None:
             self.connect()
         if self.db is None:
             raise Exception("Database not connected")
+        collection = self._collections[collection_name] = self.db[collection_name]
+        return collection
+
+    def get_bucket(self, bucket_name: str) -> GridFSBucket:
+        """Get a GridFS bucket from the database"""
+        bucket = self._buckets.get(bucket_name)
+        if bucket is not None:
+            return bucket
+        if self.db is None:
+            self.connect()
+        if self.db is None:
+            raise Exception("Database not connected")
+        bucket = self._buckets[bucket_name] = GridFSBucket(self.db, bucket_name=bucket_name)
+        return bucket
+
+class AsyncMongoDB:
+    """Async MongoDB connection manager used by the API handlers"""
+    
+    def __init__(self, uri: str = MONGO_URI):
+        self.uri = uri
+        # The client opens connections lazily, on the first query
+        self.client: AsyncMongoClient = AsyncMongoClient(uri, **MONGO_CLIENT_OPTIONS)
+        self.db: AsyncDatabase = self.client.get_default_database()
+    
+    async def connect(self) -> Optional[AsyncDatabase]:
+        """Check the connection and create indexes without blocking the event loop"""
+        try:
+            await self.client.admin.command('ping')
+            logger.info("Connected to MongoDB successfully (async)")
+        except Exception as e:
+            logger.warning("MongoDB connection failed: %s", e)
+            logger.info("Starting without MongoDB - some features will be unavailable")
+            # The client keeps retrying lazily, so requests work once MongoDB is up
+            return None
+        await self._ensure_indexes()
+        return self.db
+    
+    async def _ensure_indexes(self):
+        """Create the contract indexes if they don't exist yet"""
+        try:
+            contracts = self.db["contracts"]
+            for keys, options in CONTRACT_INDEXES:
+                await contracts.create_index(keys, **options)
+            existing = await contracts.index_information()
+            for name in OBSOLETE_CONTRACT_INDEXES:
+                if name in existing:
+                    await contracts.drop_index(name)
+        except Exception as e:
+            logger.warning("Failed to create contract indexes: %s", e)
+            
+    async def disconnect(self):
+        """Disconnect from MongoDB"""
+        await self.client.close()
+        logger.info("Disconnected from MongoDB (async)")
+    
+    def get_collection(self, collection_name: str) -> AsyncCollection:
+        """Get a collection from the database"""
         return self.db[collection_name]
 
-# Global MongoDB instance
+    def get_bucket(self, bucket_name: str) -> AsyncGridFSBucket:
+        """Get a GridFS bucket from the database"""
+        return AsyncGridFSBucket(self.db, bucket_name=bucket_name)
+
+# Global MongoDB instances: sync for the Celery worker, async for the API
 mongodb = MongoDB()
+async_mongodb = AsyncMongoDB()
 
 # Collections
 def get_contracts_collection() -> Collection:
     """Get the contracts collection"""
     return mongodb.get_collection("contracts")
 
-def get_files_collection() -> Collection:
-    """Get the files collection (for GridFS if needed)"""
-    return mongodb.get_collection("files")
+def get_files_bucket() -> GridFSBucket:
+    """Get the GridFS bucket holding the original contract PDFs"""
+    return mongodb.get_bucket("contract_files")
+
+# Async handles are resolved once and shared by every request
+_async_contracts_collection = async_mongodb.get_collection("contracts")
+_async_files_bucket = async_mongodb.get_bucket("contract_files")
+
+def get_async_contracts_collection() -> AsyncCollection:
+    """Get the contracts collection for async callers"""
+    return _async_contracts_collection
+
+def get_async_files_bucket() -> AsyncGridFSBucket:
+    """Get the GridFS bucket holding the original contract PDFs for async callers"""
+    return _async_files_bucket
 
 # Contract document schema example:
 CONTRACT_SCHEMA = {
-    "contract_id": str,        # Unique identifier
+    "_id": str,                # Same value as contract_id; inserts must set it
+    "contract_id": str,        # Unique identifier (uuid4 hex), kept for API responses
     "filename": str,           # Original filename
     "file_size": int,          # File size in bytes
-    "upload_date": str,        # ISO datetime string
+    "upload_date": datetime,   # UTC datetime
     "status": str,             # "pending", "processing", "completed", "failed"
     "progress": int,           # 0-100
-    "original_file": bytes,    # Binary file data
+    "file_id": ObjectId,       # GridFS id of the original PDF
+    "etag": str,               # SHA-1 of the original PDF
     "extracted_data": dict,    # Parsed contract data
     "score": int,              # Overall score 0-100
     "gaps": list,              # Missing fields
     "error": str,              # Error message if failed
     "confidence_scores": dict,  # Confidence per field
-    "created_at": str,         # ISO datetime string
-    "updated_at": str,         # ISO datetime string
+    "created_at": datetime,    # UTC datetime
+    "updated_at": datetime,    # UTC datetime
 }
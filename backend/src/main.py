@@ -3,11 +3,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 
 from src.api.routers import router
-from src.database.models import mongodb
-from src.core.config import PROJECT_NAME, PROJECT_DESCRIPTION, PROJECT_VERSION
+from src.api.responses import ORJSONResponse
+from src.database.models import async_mongodb
+from src.core.config import PROJECT_NAME, PROJECT_DESCRIPTION, PROJECT_VERSION, EXTRACTOR_POOL_SIZE
 
 # Configure logging
 logging.basicConfig(
@@ -23,19 +26,27 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Contract Intelligence Parser API")
     try:
-        result = mongodb.connect()
+        result = await async_mongodb.connect()
         if result is not None:
             logger.info("Connected to MongoDB successfully")
         else:
             logger.warning("Starting without MongoDB - upload features will be limited")
     except Exception as e:
-        logger.warning(f"MongoDB connection failed: {e} - continuing without MongoDB")
+        logger.warning("MongoDB connection failed: %s - continuing without MongoDB", e)
+    
+    # Fallback for parsing contracts when Celery can't take the task; workers
+    # are spawned on first use, so an idle pool costs nothing
+    app.state.extractor_pool = ProcessPoolExecutor(
+        max_workers=EXTRACTOR_POOL_SIZE,
+        mp_context=multiprocessing.get_context("spawn")
+    )
     
     yield
     
     # Shutdown
     logger.info("Shutting down Contract Intelligence Parser API")
-    mongodb.disconnect()
+    app.state.extractor_pool.shutdown(wait=False, cancel_futures=True)
+    await async_mongodb.disconnect()
 
 
 # Create FastAPI application
@@ -43,6 +54,7 @@ app = FastAPI(
     title=PROJECT_NAME,
     description=PROJECT_DESCRIPTION,
     version=PROJECT_VERSION,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
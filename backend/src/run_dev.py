@@ -1,89 +1,124 @@
 #!/usr/bin/env python3
 """
-Development server runner that starts both FastAPI and Celery worker
+Development server runner that starts FastAPI, the Celery worker and Celery beat
 """
-import subprocess
-import sys
+import asyncio
 import signal
-import os
-from multiprocessing import Process
-import time
-
-
-def run_fastapi():
-    """Run FastAPI server"""
-    cmd = [
-        sys.executable, "-m", "uvicorn", 
-        "src.main:app", 
-        "--host", "0.0.0.0", 
-        "--port", "8000", 
-        "--reload"
-    ]
-    subprocess.run(cmd)
-
-
-def run_celery():
-    """Run Celery worker"""
-    cmd = [
-        sys.executable, "-m", "celery", 
-        "-A", "src.tasks.celery", 
-        "worker", 
-        "--loglevel=info", 
-        "--pool=solo"
-    ]
-    subprocess.run(cmd)
-
-
-def signal_handler(sig, frame):
-    """Handle Ctrl+C gracefully"""
-    print('\n\nShutting down services...')
-    sys.exit(0)
-
-
-def main():
-    """Main function to start both processes"""
-    signal.signal(signal.SIGINT, signal_handler)
-    
+import sys
+
+
+FASTAPI_HOST = "127.0.0.1"
+FASTAPI_PORT = 8000
+READY_TIMEOUT = 30  # seconds to wait for FastAPI before starting Celery
+SHUTDOWN_TIMEOUT = 5  # seconds to wait for a child before killing it
+
+FASTAPI_CMD = [
+    sys.executable, "-m", "uvicorn",
+    "src.main:app",
+    "--host", "0.0.0.0",
+    "--port", str(FASTAPI_PORT),
+    "--reload"
+]
+
+CELERY_CMD = [
+    sys.executable, "-m", "celery",
+    "-A", "src.tasks.celery",
+    "worker",
+    "--loglevel=info"
+]
+
+# Run as its own process: the worker's embedded --beat is rejected on Windows
+BEAT_CMD = [
+    sys.executable, "-m", "celery",
+    "-A", "src.tasks.celery",
+    "beat",
+    "--loglevel=info"
+]
+
+
+async def wait_until_ready(host: str, port: int, timeout: float) -> bool:
+    """Poll a TCP port until it accepts connections or the timeout expires"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            await writer.wait_closed()
+            return True
+        except OSError:
+            await asyncio.sleep(0.2)
+    return False
+
+
+async def stop_process(process: asyncio.subprocess.Process):
+    """Terminate a child process, killing it if it doesn't exit in time"""
+    if process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+async def main():
+    """Start the services and supervise them until one exits or Ctrl+C"""
     print("🚀 Starting Contract Intelligence Parser Development Server")
     print("=" * 60)
-    print("📡 FastAPI Server: http://0.0.0.0:8000")
+    print(f"📡 FastAPI Server: http://0.0.0.0:{FASTAPI_PORT}")
     print("⚙️  Celery Worker: Processing contracts asynchronously")
+    print("⏰ Celery Beat: Scheduling periodic cleanup")
     print("=" * 60)
-    print("Press Ctrl+C to stop both services\n")
-    
-    # Start FastAPI process
-    fastapi_process = Process(target=run_fastapi, name="FastAPI-Server")
-    
-    # Start Celery process  
-    celery_process = Process(target=run_celery, name="Celery-Worker")
-    
+    print("Press Ctrl+C to stop all services\n")
+
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_requested.set)
+        except NotImplementedError:
+            # Windows' Proactor loop has no signal handlers
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop_requested.set))
+
+    processes = []
     try:
-        fastapi_process.start()
-        time.sleep(2)  # Give FastAPI time to start
-        celery_process.start()
-        
-        # Wait for both processes
-        fastapi_process.join()
-        celery_process.join()
-        
-    except KeyboardInterrupt:
-        print("\n\nReceived interrupt signal. Shutting down...")
+        fastapi_process = await asyncio.create_subprocess_exec(*FASTAPI_CMD)
+        processes.append(fastapi_process)
+
+        # Start Celery once FastAPI is accepting connections
+        fastapi_exited = asyncio.create_task(fastapi_process.wait())
+        stopped = asyncio.create_task(stop_requested.wait())
+        ready = asyncio.create_task(wait_until_ready(FASTAPI_HOST, FASTAPI_PORT, READY_TIMEOUT))
+        await asyncio.wait({ready, fastapi_exited, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            ready.cancel()
+        elif not ready.result():
+            print("⚠️  FastAPI did not become ready in time, starting Celery anyway")
+
+        if not (stop_requested.is_set() or fastapi_exited.done()):
+            celery_process = await asyncio.create_subprocess_exec(*CELERY_CMD)
+            processes.append(celery_process)
+            beat_process = await asyncio.create_subprocess_exec(*BEAT_CMD)
+            processes.append(beat_process)
+
+            # Wait until any service exits or a stop is requested
+            celery_exited = asyncio.create_task(celery_process.wait())
+            beat_exited = asyncio.create_task(beat_process.wait())
+            await asyncio.wait(
+                {fastapi_exited, celery_exited, beat_exited, stopped},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            celery_exited.cancel()
+            beat_exited.cancel()
+        fastapi_exited.cancel()
+        stopped.cancel()
     finally:
-        # Terminate processes
-        if fastapi_process.is_alive():
-            fastapi_process.terminate()
-            fastapi_process.join(timeout=5)
-            if fastapi_process.is_alive():
-                fastapi_process.kill()
-                
-        if celery_process.is_alive():
-            celery_process.terminate()
-            celery_process.join(timeout=5)
-            if celery_process.is_alive():
-                celery_process.kill()
-        
+        print("\n\nShutting down services...")
+        await asyncio.gather(*(stop_process(process) for process in processes))
         print("✅ All services stopped successfully")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
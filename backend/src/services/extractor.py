@@ -14,16 +14,336 @@ The extraction process leverages confidence scoring to assess the reliability of
 identified information and provides comprehensive metadata about the extraction process.
 """
 
-import pdfplumber
 import re
-from io import BytesIO
-from typing import Dict, List, Any, Optional
+import multiprocessing
+from bisect import bisect_left
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 import logging
-from src.core.utils import extract_confidence_score
+from src.core.config import MAX_PAGES_PROCESS, PDF_PAGE_WORKERS, PDF_PARALLEL_MIN_PAGES
+from src.core.utils import context_window, extract_confidence_score
 from src.core.exceptions import ExtractionError
 
+# PyMuPDF takes longer to import than the rest of the app's imports combined, and
+# only processes that actually extract need it, so it's imported where it's used
+if TYPE_CHECKING:
+    import pymupdf
+
 logger = logging.getLogger(__name__)
 
+# Vertical distance (points) within which words are treated as one line;
+# the same default pdfplumber's extract_text used
+_LINE_TOLERANCE = 3
+
+# Flags extract_confidence_score applies to string patterns; patterns compiled
+# for it below use the same flags so results don't change
+_CONFIDENCE_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Besides characters whose lowercase is longer (like "İ"), the only ones
+# IGNORECASE matches differently from their lower(): they stay unchanged
+# when lowered but match "i" and "s"
+_UNFOLDED_CHARS = ("ı", "ſ")
+
+
+def _page_text(page: "pymupdf.Page") -> str:
+    """Rebuild a page's text line by line from its words
+
+    PyMuPDF's plain text output breaks a line wherever the PDF starts a new
+    text span (e.g. after a bold "Client:" label), which splits labels from
+    their values. Grouping words by their vertical position instead gives the
+    same lines pdfplumber produced, which the extraction patterns expect.
+
+    Args:
+        page: PyMuPDF page
+
+    Returns:
+        Page text with words on a line separated by single spaces
+    """
+    words = page.get_text("words")
+    words.sort(key=lambda word: (word[1], word[0]))
+
+    lines = []
+    line = []
+    line_top = 0.0
+    for word in words:
+        if line and word[1] - line_top > _LINE_TOLERANCE:
+            lines.append(line)
+            line = []
+        if not line:
+            line_top = word[1]
+        line.append(word)
+    if line:
+        lines.append(line)
+
+    return "\n".join(
+        " ".join(word[4] for word in sorted(line, key=lambda word: word[0]))
+        for line in lines
+    )
+
+
+def _extract_page_range(file_bytes: bytes, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop); runs in a page pool worker"""
+    import pymupdf
+
+    with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+        return [_page_text(doc[index]) for index in range(start, stop)]
+
+
+# Process pool for large PDFs, created on first use. PyMuPDF isn't thread-safe,
+# so pages are split across processes, each opening its own copy of the document
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Return the shared page extraction pool, creating it if needed"""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PDF_PAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _page_pool
+
+
+# (lowercase literals, compiled pattern, folded pattern): every match of the
+# pattern contains at least one of the literals, so texts without any of them
+# are skipped. The folded pattern is the case-sensitive lowercase twin of the
+# pattern, for running over the lowered text
+AnchoredPatterns = List[Tuple[Tuple[str, ...], "re.Pattern[str]", "re.Pattern[str]"]]
+
+
+def _compile_all(patterns: List[str], flags: int = _CONFIDENCE_FLAGS) -> List["re.Pattern[str]"]:
+    """Compile a list of patterns with shared flags"""
+    return [re.compile(pattern, flags) for pattern in patterns]
+
+
+def _fold(pattern: "re.Pattern[str]") -> "re.Pattern[str]":
+    """Compile the case-sensitive lowercase twin of an IGNORECASE pattern
+
+    Matching lowered text without IGNORECASE is much faster: the engine can
+    search for a literal prefix instead of case-folding every character.
+    """
+    if re.search(r'\\[A-Z]', pattern.pattern):
+        raise ValueError(f"Can't lowercase a pattern with uppercase escapes: {pattern.pattern!r}")
+    return re.compile(pattern.pattern.lower(), pattern.flags & ~re.IGNORECASE)
+
+
+def _anchor(anchors: Tuple[str, ...], pattern: "re.Pattern[str]") -> Tuple[Tuple[str, ...], "re.Pattern[str]", "re.Pattern[str]"]:
+    """Build an AnchoredPatterns entry for a compiled pattern"""
+    return anchors, pattern, _fold(pattern)
+
+
+def _compile_anchored(patterns: List[Tuple[Tuple[str, ...], str]],
+                      flags: int = _CONFIDENCE_FLAGS) -> AnchoredPatterns:
+    """Compile (anchors, pattern) pairs with shared flags"""
+    return [_anchor(anchors, re.compile(pattern, flags)) for anchors, pattern in patterns]
+
+
+def _first_confident_match(text: str, lowered: str, patterns: AnchoredPatterns,
+                           field_name: str) -> Optional[Dict[str, Any]]:
+    """Score the first pattern that matches, skipping those whose anchors are absent
+
+    The folded patterns run over the lowered text, unless lowering doesn't
+    line up with how IGNORECASE matches the original text.
+
+    Args:
+        text: Contract text
+        lowered: text.lower(), shared by the anchor checks
+        patterns: Anchored patterns, tried in order
+        field_name: Name of the field being extracted
+
+    Returns:
+        extract_confidence_score result for the first match, or None
+    """
+    search_lower = len(lowered) == len(text) and not any(char in lowered for char in _UNFOLDED_CHARS)
+    for anchors, pattern, folded in patterns:
+        if not any(anchor in lowered for anchor in anchors):
+            continue
+        if search_lower:
+            result = extract_confidence_score(text, folded, field_name, lowered, search_lower=True)
+        else:
+            result = extract_confidence_score(text, pattern, field_name, lowered)
+        if result["value"]:
+            return result
+    return None
+
+
+def _literal_confidence(text_lower: str, literal: str, field_name: str) -> int:
+    """Confidence extract_confidence_score gives a literal (escaped) pattern
+
+    Counts occurrences with str.count on the lowered text instead of
+    compiling a case-insensitive regex for every literal.
+
+    Args:
+        text_lower: Lowercased text to search in
+        literal: Lowercased literal to look for
+        field_name: Name of the field being extracted
+
+    Returns:
+        Confidence score, 0 if the literal doesn't occur
+    """
+    count = text_lower.count(literal)
+    if not count:
+        return 0
+
+    confidence = min(85 + count * 5, 95)
+    if count == 1:
+        context = context_window(text_lower, literal, 50)
+        if field_name.lower() in context:
+            confidence += 10
+
+    return min(confidence, 95)
+
+
+# Total contract value, tried in order
+_TOTAL_VALUE_PATTERNS = _compile_anchored([
+    (("total",), r'Total\s*(?:Contract\s*)?(?:Value|Amount)[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'),
+    (("contract",), r'Contract\s*Value[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'),
+    (("total",), r'Total[\s:]*\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'),
+    (("amount",), r'Amount\s*Due[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'),
+])
+
+# Line items with descriptions, quantities, and prices; scanning stops after
+# the first _MAX_LINE_ITEMS
+_MAX_LINE_ITEMS = 10
+_LINE_ITEM_RE = re.compile(
+    r'([A-Z][^$\n]*?)\s+(\d+)\s+\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
+    re.MULTILINE
+)
+
+_TAX_PATTERNS = _compile_anchored([
+    (("tax",), r'Tax\s*Rate[\s:]*(\d+(?:\.\d+)?%)'),
+    (("vat",), r'VAT[\s:]*(\d+(?:\.\d+)?%)'),
+    (("tax",), r'Sales\s*Tax[\s:]*(\d+(?:\.\d+)?%)'),
+])
+
+_SCHEDULE_PATTERNS = _compile_anchored([
+    (("schedule",), r'(?:Payment|Billing)\s*Schedule[\s:]*([^\n\.]+)'),
+    (("payment",), r'(?:Monthly|Quarterly|Annual|Weekly)\s*payments?'),
+])
+
+_PAYMENT_METHOD_PATTERNS = _compile_anchored([
+    (("method",), r'Payment\s*Method[\s:]*([^\n\.]+)'),
+    (("wire", "ach", "check", "credit"), r'(?:Wire\s*Transfer|ACH|Check|Credit\s*Card)'),
+])
+
+_RESPONSE_TIME_PATTERNS = _compile_anchored([
+    (("response",), r'Response\s*Time[\s:]*(\d+\s*(?:hours?|minutes?|days?))'),
+    (("response",), r'(\d+\s*(?:hour|minute|day))\s*response'),
+])
+
+_UPTIME_PATTERNS = _compile_anchored([
+    (("uptime", "availability"), r'(?:Uptime|Availability)[\s:]*(\d+(?:\.\d+)?%)'),
+    (("uptime", "availability"), r'(\d+(?:\.\d+)?%)\s*(?:uptime|availability)'),
+])
+
+_PENALTY_PATTERNS = _compile_anchored([
+    (("penalty",), r'Penalty[\s:]*([^\n\.]+)'),
+    (("reduction", "penalty"), r'(?:reduction|penalty).*?(\d+(?:\.\d+)?%)'),
+])
+
+_EMAIL_RE = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+# US format phone numbers
+_PHONE_RE = re.compile(r'(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})')
+
+_ACCOUNT_PATTERNS = _compile_anchored([
+    (("account",), r'Account\s*(?:Number|#)[\s:]*([A-Z0-9-]+)'),
+    (("customer",), r'Customer\s*ID[\s:]*([A-Z0-9-]+)'),
+])
+
+# Billing address (simplified multi-line extraction): the label is found with
+# str.find, then the value after it is matched in place. "Billing Address"
+# captures the same lines as the "Address" inside it, so only that is looked for
+_ADDRESS_RE = re.compile(r'(?:Billing\s*Address|Address)[\s:]*([^\n]+(?:\n[^\n]+){0,3})', re.IGNORECASE | re.MULTILINE)
+_ADDRESS_VALUE_RE = re.compile(r'[\s:]*([^\n]+(?:\n[^\n]+){0,3})')
+
+class _EntityNameScanner:
+    """Linear-time findall for company names ending in a legal suffix
+
+    Equivalent to findall with
+    r'([A-Z][A-Za-z\s]+(?:Inc\.|LLC|Ltd\.|Corp\.|Company))' and
+    re.IGNORECASE | re.MULTILINE. The regex backtracks through the whole
+    run of letters and whitespace from every capital it tries, which is
+    quadratic: 34 KB of plain prose took over 30 seconds. Within one run the
+    greedy match always ends at the run's last suffix, so the scanner finds
+    runs and suffix positions once and pairs them up directly.
+    """
+
+    pattern = r'([A-Z][A-Za-z\s]+(?:Inc\.|LLC|Ltd\.|Corp\.|Company))'
+
+    _RUN_RE = re.compile(r'[A-Za-z\s]+', _CONFIDENCE_FLAGS)
+    _START_RE = re.compile(r'[A-Z]', _CONFIDENCE_FLAGS)
+    # Lookahead so overlapping suffixes are all found; the group is the
+    # alternative the regex would pick at that position
+    _SUFFIX_RE = re.compile(r'(?=(Inc\.|LLC|Ltd\.|Corp\.|Company))', _CONFIDENCE_FLAGS)
+
+    def findall(self, text: str) -> List[str]:
+        """Return the names findall would, in order"""
+        suffix_starts = []
+        suffix_ends = []
+        for match in self._SUFFIX_RE.finditer(text):
+            suffix_starts.append(match.start())
+            suffix_ends.append(match.end(1))
+        if not suffix_starts:
+            return []
+
+        names = []
+        for run in self._RUN_RE.finditer(text):
+            # The greedy match from any start in the run backs off to the last
+            # suffix starting inside it, so each run yields at most one name
+            last = bisect_left(suffix_starts, run.end()) - 1
+            if last < 0:
+                continue
+            start = self._START_RE.search(text, run.start(), run.end())
+            # [A-Za-z\s]+ needs at least one character before the suffix
+            if start is not None and suffix_starts[last] >= start.start() + 2:
+                names.append(text[start.start():suffix_ends[last]])
+        return names
+
+
+# Role keywords looked for around a (lowercased) party name
+_ROLE_CLIENT_RE = re.compile(r'client|customer|buyer|purchaser')
+_ROLE_PROVIDER_RE = re.compile(r'vendor|supplier|contractor|service provider')
+_ROLE_PARTNER_RE = re.compile(r'partner|joint venture')
+
+# Legal entity suffix following a party name, up to the end of the clause
+_ENTITY_SUFFIX_RE = re.compile(r'[^,\n\.]*?(Inc\.|LLC|Ltd\.|Corp\.|Company|Corporation)', re.IGNORECASE)
+
+# Renewal terms, up to the end of the sentence
+_RENEWAL_RE = re.compile(r'(?:renewal|auto-renew|automatically\s*renew)[^\n\.]*', re.IGNORECASE)
+
+# Currency detection patterns - supports USD, EUR, GBP formats
+_CURRENCY_PATTERNS = _compile_all([
+    r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # USD format: $1,000.00
+    r'USD\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # USD explicit: USD 1000
+    r'€\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',   # EUR format: €1.000,00
+    r'£\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',   # GBP format: £1,000.00
+])
+
+# Payment terms patterns - identifies net payment periods, tried in order
+_PAYMENT_TERMS_PATTERNS = _compile_all([
+    r'Net\s*(\d+)\s*days?',           # "Net 30 days"
+    r'(\d+)\s*days?\s*net',           # "30 days net"
+    r'Payment\s*due\s*in\s*(\d+)\s*days?',  # "Payment due in 30 days"
+    r'Terms?\s*:\s*Net\s*(\d+)',      # "Terms: Net 30"
+])
+_PAYMENT_TERMS_ANCHORS = (("net",), ("net",), ("payment",), ("term",))
+_ANCHORED_PAYMENT_TERMS = [
+    _anchor(anchors, pattern) for anchors, pattern in zip(_PAYMENT_TERMS_ANCHORS, _PAYMENT_TERMS_PATTERNS)
+]
+
+# Party identification patterns - finds company names and roles; the
+# company-name pattern is scanned in linear time (see _EntityNameScanner)
+_PARTY_PATTERNS = [
+    re.compile(r'(?:Party|Contractor|Vendor|Client|Customer)[\s:]+([A-Z][^,\n\.]+(?:Inc\.|LLC|Ltd\.|Corp\.)?)', _CONFIDENCE_FLAGS),
+    _EntityNameScanner(),
+    re.compile(r'between\s+([A-Z][^,\n]+?)(?:\s+and|\s*,)', _CONFIDENCE_FLAGS),
+]
+
 
 class ContractExtractor:
     """Main class for extracting data from contract PDFs
@@ -34,39 +354,22 @@ class ContractExtractor:
     confidence scoring for extracted data.
 
     Attributes:
-        currency_patterns (List[str]): Regex patterns for currency detection
-        payment_terms_patterns (List[str]): Patterns for payment terms extraction
-        party_patterns (List[str]): Patterns for identifying contract parties
+        currency_patterns (List[re.Pattern]): Compiled patterns for currency detection
+        payment_terms_patterns (List[re.Pattern]): Compiled patterns for payment terms extraction
+        party_patterns (List): Compiled patterns (or pattern-like scanners) for identifying contract parties
     """
 
     def __init__(self):
         """Initialize the ContractExtractor with predefined regex patterns
 
-        Sets up comprehensive regex patterns for various contract elements
-        including currencies, payment terms, and party identification.
+        Binds the regex patterns for various contract elements including
+        currencies, payment terms, and party identification. The patterns are
+        compiled once at import time and shared by every instance.
         """
-        # Currency detection patterns - supports USD, EUR, GBP formats
-        self.currency_patterns = [
-            r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # USD format: $1,000.00
-            r'USD\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # USD explicit: USD 1000
-            r'€\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',   # EUR format: €1.000,00
-            r'£\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',   # GBP format: £1,000.00
-        ]
-
-        # Payment terms patterns - identifies net payment periods
-        self.payment_terms_patterns = [
-            r'Net\s*(\d+)\s*days?',           # "Net 30 days"
-            r'(\d+)\s*days?\s*net',           # "30 days net"
-            r'Payment\s*due\s*in\s*(\d+)\s*days?',  # "Payment due in 30 days"
-            r'Terms?\s*:\s*Net\s*(\d+)',      # "Terms: Net 30"
-        ]
-
-        # Party identification patterns - finds company names and roles
-        self.party_patterns = [
-            r'(?:Party|Contractor|Vendor|Client|Customer)[\s:]+([A-Z][^,\n\.]+(?:Inc\.|LLC|Ltd\.|Corp\.)?)',
-            r'([A-Z][A-Za-z\s]+(?:Inc\.|LLC|Ltd\.|Corp\.|Company))',
-            r'between\s+([A-Z][^,\n]+?)(?:\s+and|\s*,)',
-        ]
+        self.currency_patterns = _CURRENCY_PATTERNS
+        self.payment_terms_patterns = _PAYMENT_TERMS_PATTERNS
+        self.party_patterns = _PARTY_PATTERNS
+        self._anchored_payment_terms = _ANCHORED_PAYMENT_TERMS
         
     def extract_data(self, file_bytes: bytes) -> Dict[str, Any]:
         """Extract structured data from PDF contract
@@ -97,81 +400,104 @@ class ContractExtractor:
         """
         try:
             # Step 1: Extract raw text from PDF
-            text = self._extract_text_from_pdf(file_bytes)
+            text, n_pages = self._extract_text_and_pagecount(file_bytes)
 
             # Validate minimum content requirements
             if not text or len(text.strip()) < 100:
                 raise ExtractionError("PDF contains insufficient text content")
 
-            # Step 2: Extract different contract components using specialized methods
+            # Step 2: Extract different contract components using specialized methods;
+            # the lowercased text is computed once and shared by all of them
+            text_lower = text.lower()
             extracted_data = {
-                "parties": self._extract_parties(text),
-                "financial_details": self._extract_financial_details(text),
-                "payment_structure": self._extract_payment_structure(text),
-                "sla_terms": self._extract_sla_terms(text),
+                "parties": self._extract_parties(text, text_lower),
+                "financial_details": self._extract_financial_details(text, text_lower),
+                "payment_structure": self._extract_payment_structure(text, text_lower),
+                "sla_terms": self._extract_sla_terms(text, text_lower),
                 "contact_information": self._extract_contact_information(text),
-                "account_information": self._extract_account_information(text),
-                "revenue_classification": self._extract_revenue_classification(text),
+                "account_information": self._extract_account_information(text, text_lower),
+                "revenue_classification": self._extract_revenue_classification(text, text_lower),
                 "raw_text_length": len(text),
                 "extraction_metadata": {
-                    "total_pages": self._count_pages(file_bytes),
-                    "extraction_method": "pdfplumber + regex",
+                    "total_pages": n_pages,
+                    "extraction_method": "pymupdf + regex",
                     "text_length": len(text)
                 }
             }
 
-            logger.info(f"Successfully extracted data from contract. Text length: {len(text)} chars")
+            logger.info("Successfully extracted data from contract. Text length: %s chars", len(text))
             return extracted_data
 
         except Exception as e:
-            logger.error(f"Contract extraction failed: {str(e)}")
+            logger.error("Contract extraction failed: %s", e)
             raise ExtractionError(f"Failed to extract contract data: {str(e)}")
     
-    def _extract_text_from_pdf(self, file_bytes: bytes) -> str:
-        """Extract text from PDF using pdfplumber
+    def _extract_text_and_pagecount(self, file_bytes: bytes) -> Tuple[str, int]:
+        """Extract text and the page count from PDF using PyMuPDF
 
-        Uses the pdfplumber library to extract readable text from PDF documents.
-        This method handles multi-page documents and concatenates text from all pages.
+        Uses MuPDF's native parser to extract readable text from PDF documents,
+        opening the document once for both the text and the page count. This
+        method handles multi-page documents and concatenates text from all pages,
+        or from the first MAX_PAGES_PROCESS pages when that limit is set; pages past
+        the limit are never parsed.
 
         Args:
             file_bytes: Binary PDF data
 
         Returns:
-            Extracted text content as a single string
+            Tuple of the extracted text as a single string and the total page count
 
         Raises:
             ExtractionError: If PDF parsing fails
         """
-        try:
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
+        import pymupdf
 
-                full_text = "\n".join(text_parts)
-                return full_text
+        try:
+            with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+                n_pages = doc.page_count
+                n_text_pages = min(n_pages, MAX_PAGES_PROCESS) if MAX_PAGES_PROCESS > 0 else n_pages
+                # Daemonic processes, like Celery's prefork workers, can't start
+                # children; those already use a CPU each
+                if (PDF_PAGE_WORKERS > 1 and n_text_pages >= PDF_PARALLEL_MIN_PAGES
+                        and not multiprocessing.current_process().daemon):
+                    page_texts = self._extract_pages_in_parallel(file_bytes, n_text_pages)
+                else:
+                    page_texts = [_page_text(doc[index]) for index in range(n_text_pages)]
+
+            text_parts = [page_text for page_text in page_texts if page_text]
+            full_text = "\n".join(text_parts)
+            return full_text, n_pages
 
         except Exception as e:
             raise ExtractionError(f"Failed to extract text from PDF: {str(e)}")
 
-    def _count_pages(self, file_bytes: bytes) -> int:
-        """Count pages in PDF document
+    def _extract_pages_in_parallel(self, file_bytes: bytes, n_pages: int) -> List[str]:
+        """Extract page texts by splitting the document into page ranges
+
+        Each worker gets one contiguous range, and results are collected
+        in submission order so pages stay in document order.
 
         Args:
             file_bytes: Binary PDF data
+            n_pages: Number of pages to extract, from the first page
 
         Returns:
-            Number of pages in the PDF, or 0 if counting fails
+            Text of every page, in page order
         """
-        try:
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                return len(pdf.pages)
-        except:
-            return 0
-    
-    def _extract_parties(self, text: str) -> List[Dict[str, Any]]:
+        pool = _get_page_pool()
+        step = -(-n_pages // PDF_PAGE_WORKERS)  # ceiling division
+        futures = [
+            pool.submit(_extract_page_range, file_bytes, start, min(start + step, n_pages))
+            for start in range(0, n_pages, step)
+        ]
+
+        page_texts = []
+        for future in futures:
+            page_texts.extend(future.result())
+        return page_texts
+
+    def _extract_parties(self, text: str,
+                         text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract contract parties from text
 
         Identifies companies and individuals mentioned as parties to the contract.
@@ -180,37 +506,43 @@ class ContractExtractor:
 
         Args:
             text: Full contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             List of party dictionaries with name, role, legal entity, and confidence
         """
         parties = []
+        seen_names = set()
+        if text_lower is None:
+            text_lower = text.lower()
 
         for pattern in self.party_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
+            matches = pattern.findall(text)
             for match in matches:
                 party_name = match.strip()
-                if len(party_name) > 3 and party_name not in [p["name"] for p in parties]:
+                if len(party_name) > 3 and party_name not in seen_names:
+                    seen_names.add(party_name)
 
                     # Determine party role based on context
-                    role = self._determine_party_role(text, party_name)
+                    role = self._determine_party_role(text, party_name, text_lower)
 
                     # Extract additional party details
-                    legal_entity = self._extract_legal_entity_details(text, party_name)
+                    legal_entity = self._extract_legal_entity_details(text, party_name, text_lower)
 
                     # Calculate confidence score for this extraction
-                    confidence = extract_confidence_score(text, re.escape(party_name), "party")
+                    confidence = _literal_confidence(text_lower, party_name.lower(), "party")
 
                     parties.append({
                         "name": party_name,
                         "role": role,
                         "legal_entity": legal_entity,
-                        "confidence": confidence["confidence"]
+                        "confidence": confidence
                     })
 
         return parties[:4]  # Limit to 4 parties max to avoid duplicates
 
-    def _determine_party_role(self, text: str, party_name: str) -> str:
+    def _determine_party_role(self, text: str, party_name: str,
+                              text_lower: Optional[str] = None) -> str:
         """Determine the role of a party in the contract
 
         Analyzes the context around a party name to determine if they are
@@ -219,24 +551,27 @@ class ContractExtractor:
         Args:
             text: Full contract text
             party_name: Name of the party to analyze
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Role classification: "Client", "Service Provider", "Partner", or "Party"
         """
-        party_context = re.search(f".{{0,100}}{re.escape(party_name)}.{{0,100}}", text, re.IGNORECASE)
+        if text_lower is None:
+            text_lower = text.lower()
+        context = context_window(text_lower, party_name.lower(), 100)
 
-        if party_context:
-            context = party_context.group().lower()
-            if any(word in context for word in ['client', 'customer', 'buyer', 'purchaser']):
+        if context is not None:
+            if _ROLE_CLIENT_RE.search(context):
                 return "Client"
-            elif any(word in context for word in ['vendor', 'supplier', 'contractor', 'service provider']):
+            elif _ROLE_PROVIDER_RE.search(context):
                 return "Service Provider"
-            elif any(word in context for word in ['partner', 'joint venture']):
+            elif _ROLE_PARTNER_RE.search(context):
                 return "Partner"
 
         return "Party"
 
-    def _extract_legal_entity_details(self, text: str, party_name: str) -> Optional[str]:
+    def _extract_legal_entity_details(self, text: str, party_name: str,
+                                      text_lower: Optional[str] = None) -> Optional[str]:
         """Extract legal entity information for a party
 
         Looks for legal entity suffixes like Inc., LLC, Corp. associated with the party.
@@ -244,16 +579,32 @@ class ContractExtractor:
         Args:
             text: Full contract text
             party_name: Name of the party
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Legal entity type (e.g., "Inc.", "LLC") or None if not found
         """
-        entity_pattern = rf"{re.escape(party_name)}[^,\n\.]*?(Inc\.|LLC|Ltd\.|Corp\.|Company|Corporation)"
-        match = re.search(entity_pattern, text, re.IGNORECASE)
+        if text_lower is None:
+            text_lower = text.lower()
+        if len(text_lower) != len(text):
+            # Lowercasing changed some offsets; search the original text instead
+            entity_pattern = re.escape(party_name) + _ENTITY_SUFFIX_RE.pattern
+            match = re.search(entity_pattern, text, re.IGNORECASE)
+            return match.group(1) if match else None
+
+        # Try each occurrence of the name until one is followed by a suffix
+        name = party_name.lower()
+        idx = text_lower.find(name)
+        while idx >= 0:
+            match = _ENTITY_SUFFIX_RE.match(text, idx + len(name))
+            if match:
+                return match.group(1)
+            idx = text_lower.find(name, idx + 1)
 
-        return match.group(1) if match else None
+        return None
     
-    def _extract_financial_details(self, text: str) -> Dict[str, Any]:
+    def _extract_financial_details(self, text: str,
+                                   text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract financial information from contract
 
         Comprehensive extraction of all financial aspects including contract values,
@@ -261,20 +612,23 @@ class ContractExtractor:
 
         Args:
             text: Full contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary containing financial details with confidence scores
         """
         financial_details = {}
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Extract total contract value
-        total_value = self._extract_total_value(text)
+        total_value = self._extract_total_value(text, text_lower)
         if total_value:
             financial_details["total_value"] = total_value["value"]
             financial_details["total_value_confidence"] = total_value["confidence"]
 
         # Extract currency information
-        currency = self._extract_currency(text)
+        currency = self._extract_currency(text, text_lower)
         if currency:
             financial_details["currency"] = currency
 
@@ -284,13 +638,14 @@ class ContractExtractor:
             financial_details["line_items"] = line_items
 
         # Extract tax information
-        tax_info = self._extract_tax_information(text)
+        tax_info = self._extract_tax_information(text, text_lower)
         if tax_info:
             financial_details["tax_information"] = tax_info
 
         return financial_details
 
-    def _extract_total_value(self, text: str) -> Optional[Dict[str, Any]]:
+    def _extract_total_value(self, text: str,
+                             text_lower: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Extract total contract value
 
         Uses multiple patterns to find contract totals, handling various
@@ -298,43 +653,46 @@ class ContractExtractor:
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary with value and confidence score, or None if not found
         """
-        value_patterns = [
-            r'Total\s*(?:Contract\s*)?(?:Value|Amount)[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Contract\s*Value[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Total[\s:]*\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Amount\s*Due[\s:]*\$?\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-        ]
-
-        for pattern in value_patterns:
-            result = extract_confidence_score(text, pattern, "total_value")
-            if result["value"]:
-                return {
-                    "value": f"${result['value']}",
-                    "confidence": result["confidence"]
-                }
+        if text_lower is None:
+            text_lower = text.lower()
+        result = _first_confident_match(text, text_lower, _TOTAL_VALUE_PATTERNS, "total_value")
+        if result:
+            return {
+                "value": f"${result['value']}",
+                "confidence": result["confidence"]
+            }
 
         return None
 
-    def _extract_currency(self, text: str) -> Optional[str]:
+    def _extract_currency(self, text: str,
+                          text_lower: Optional[str] = None) -> Optional[str]:
         """Extract currency information
 
         Detects currency type from symbols and explicit mentions.
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Currency code ("USD", "EUR", "GBP") or None
         """
-        if re.search(r'\$|USD|US Dollar', text, re.IGNORECASE):
+        # Symbols are checked on the original text; names only need lowering
+        # when no symbol is present
+        if "$" in text:
+            return "USD"
+        if text_lower is None:
+            text_lower = text.lower()
+        if "usd" in text_lower or "us dollar" in text_lower:
             return "USD"
-        elif re.search(r'€|EUR|Euro', text, re.IGNORECASE):
+        elif "€" in text or "eur" in text_lower:  # "eur" also covers "euro"
             return "EUR"
-        elif re.search(r'£|GBP|British Pound', text, re.IGNORECASE):
+        elif "£" in text or "gbp" in text_lower or "british pound" in text_lower:
             return "GBP"
 
         return None
@@ -352,148 +710,114 @@ class ContractExtractor:
         """
         line_items = []
 
-        # Pattern for line items with descriptions, quantities, and prices
-        line_pattern = r'([A-Z][^$\n]*?)\s+(\d+)\s+\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-
-        matches = re.findall(line_pattern, text, re.MULTILINE)
-
-        for match in matches:
+        for match in _LINE_ITEM_RE.finditer(text):
+            if len(line_items) == _MAX_LINE_ITEMS:
+                break
+            description, quantity, unit_price, total = match.groups()
             line_items.append({
-                "description": match[0].strip(),
-                "quantity": int(match[1]),
-                "unit_price": f"${match[2]}",
-                "total": f"${match[3]}"
+                "description": description.strip(),
+                "quantity": int(quantity),
+                "unit_price": f"${unit_price}",
+                "total": f"${total}"
             })
 
-        return line_items[:10]  # Limit to 10 line items
+        return line_items
 
-    def _extract_tax_information(self, text: str) -> Optional[Dict[str, Any]]:
+    def _extract_tax_information(self, text: str,
+                                 text_lower: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Extract tax information
 
         Finds tax rates and types mentioned in the contract.
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary with tax rate and confidence, or None
         """
-        tax_patterns = [
-            r'Tax\s*Rate[\s:]*(\d+(?:\.\d+)?%)',
-            r'VAT[\s:]*(\d+(?:\.\d+)?%)',
-            r'Sales\s*Tax[\s:]*(\d+(?:\.\d+)?%)',
-        ]
-
-        for pattern in tax_patterns:
-            result = extract_confidence_score(text, pattern, "tax")
-            if result["value"]:
-                return {
-                    "rate": result["value"],
-                    "confidence": result["confidence"]
-                }
+        if text_lower is None:
+            text_lower = text.lower()
+        result = _first_confident_match(text, text_lower, _TAX_PATTERNS, "tax")
+        if result:
+            return {
+                "rate": result["value"],
+                "confidence": result["confidence"]
+            }
 
         return None
     
-    def _extract_payment_structure(self, text: str) -> Dict[str, Any]:
+    def _extract_payment_structure(self, text: str,
+                                   text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract payment terms and structure
 
         Identifies payment schedules, terms, and methods from contract text.
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary containing payment structure details
         """
         payment_structure = {}
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Extract payment terms (e.g., "Net 30 days")
-        for pattern in self.payment_terms_patterns:
-            result = extract_confidence_score(text, pattern, "payment_terms")
-            if result["value"]:
-                payment_structure["terms"] = f"Net {result['value']}"
-                payment_structure["terms_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, self._anchored_payment_terms, "payment_terms")
+        if result:
+            payment_structure["terms"] = f"Net {result['value']}"
+            payment_structure["terms_confidence"] = result["confidence"]
 
         # Extract payment schedule
-        schedule_patterns = [
-            r'(?:Payment|Billing)\s*Schedule[\s:]*([^\n\.]+)',
-            r'(?:Monthly|Quarterly|Annual|Weekly)\s*payments?',
-        ]
-
-        for pattern in schedule_patterns:
-            result = extract_confidence_score(text, pattern, "schedule")
-            if result["value"]:
-                payment_structure["schedule"] = result["value"]
-                payment_structure["schedule_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _SCHEDULE_PATTERNS, "schedule")
+        if result:
+            payment_structure["schedule"] = result["value"]
+            payment_structure["schedule_confidence"] = result["confidence"]
 
         # Extract payment method
-        method_patterns = [
-            r'Payment\s*Method[\s:]*([^\n\.]+)',
-            r'(?:Wire\s*Transfer|ACH|Check|Credit\s*Card)',
-        ]
-
-        for pattern in method_patterns:
-            result = extract_confidence_score(text, pattern, "payment_method")
-            if result["value"]:
-                payment_structure["method"] = result["value"]
-                payment_structure["method_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _PAYMENT_METHOD_PATTERNS, "payment_method")
+        if result:
+            payment_structure["method"] = result["value"]
+            payment_structure["method_confidence"] = result["confidence"]
 
         return payment_structure
 
-    def _extract_sla_terms(self, text: str) -> Dict[str, Any]:
+    def _extract_sla_terms(self, text: str,
+                           text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract Service Level Agreement terms
 
         Finds SLA components like response times, uptime guarantees, and penalties.
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary containing SLA terms and conditions
         """
         sla_terms = {}
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Extract response time requirements
-        response_patterns = [
-            r'Response\s*Time[\s:]*(\d+\s*(?:hours?|minutes?|days?))',
-            r'(\d+\s*(?:hour|minute|day))\s*response',
-        ]
-
-        for pattern in response_patterns:
-            result = extract_confidence_score(text, pattern, "response_time")
-            if result["value"]:
-                sla_terms["response_time"] = result["value"]
-                sla_terms["response_time_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _RESPONSE_TIME_PATTERNS, "response_time")
+        if result:
+            sla_terms["response_time"] = result["value"]
+            sla_terms["response_time_confidence"] = result["confidence"]
 
         # Extract uptime guarantee
-        uptime_patterns = [
-            r'(?:Uptime|Availability)[\s:]*(\d+(?:\.\d+)?%)',
-            r'(\d+(?:\.\d+)?%)\s*(?:uptime|availability)',
-        ]
-
-        for pattern in uptime_patterns:
-            result = extract_confidence_score(text, pattern, "uptime")
-            if result["value"]:
-                sla_terms["uptime_guarantee"] = result["value"]
-                sla_terms["uptime_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _UPTIME_PATTERNS, "uptime")
+        if result:
+            sla_terms["uptime_guarantee"] = result["value"]
+            sla_terms["uptime_confidence"] = result["confidence"]
 
         # Extract penalty clauses
-        penalty_patterns = [
-            r'Penalty[\s:]*([^\n\.]+)',
-            r'(?:reduction|penalty).*?(\d+(?:\.\d+)?%)',
-        ]
-
-        for pattern in penalty_patterns:
-            result = extract_confidence_score(text, pattern, "penalties")
-            if result["value"]:
-                sla_terms["penalties"] = result["value"]
-                sla_terms["penalties_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _PENALTY_PATTERNS, "penalties")
+        if result:
+            sla_terms["penalties"] = result["value"]
+            sla_terms["penalties_confidence"] = result["confidence"]
 
         return sla_terms
 
@@ -510,58 +834,58 @@ class ContractExtractor:
         """
         contact_info = {}
 
-        # Extract email addresses
-        email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        emails = re.findall(email_pattern, text)
+        # Extract email addresses (only possible if the text has an "@")
+        emails = _EMAIL_RE.findall(text) if "@" in text else []
 
         if emails:
-            contact_info["emails"] = list(set(emails))  # Remove duplicates
+            contact_info["emails"] = list(dict.fromkeys(emails))  # Remove duplicates, keep order
 
         # Extract phone numbers (US format)
-        phone_pattern = r'(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'
-        phones = re.findall(phone_pattern, text)
+        phones = _PHONE_RE.findall(text)
 
         if phones:
-            contact_info["phones"] = [f"({phone[0]}) {phone[1]}-{phone[2]}" for phone in phones]
+            contact_info["phones"] = [f"({area}) {prefix}-{line}" for area, prefix, line in phones]
 
         return contact_info
 
-    def _extract_account_information(self, text: str) -> Dict[str, Any]:
+    def _extract_account_information(self, text: str,
+                                     text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract account and billing information
 
         Finds account numbers, customer IDs, and billing addresses.
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary containing account-related information
         """
         account_info = {}
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Extract account number
-        account_patterns = [
-            r'Account\s*(?:Number|#)[\s:]*([A-Z0-9-]+)',
-            r'Customer\s*ID[\s:]*([A-Z0-9-]+)',
-        ]
-
-        for pattern in account_patterns:
-            result = extract_confidence_score(text, pattern, "account_number")
-            if result["value"]:
-                account_info["account_number"] = result["value"]
-                account_info["account_confidence"] = result["confidence"]
-                break
+        result = _first_confident_match(text, text_lower, _ACCOUNT_PATTERNS, "account_number")
+        if result:
+            account_info["account_number"] = result["value"]
+            account_info["account_confidence"] = result["confidence"]
 
         # Extract billing address (simplified multi-line extraction)
-        address_pattern = r'(?:Billing\s*Address|Address)[\s:]*([^\n]+(?:\n[^\n]+){0,3})'
-        address_match = re.search(address_pattern, text, re.IGNORECASE | re.MULTILINE)
+        if len(text_lower) != len(text):
+            # Lowercasing changed some lengths, so offsets don't carry over
+            address_match = _ADDRESS_RE.search(text)
+        else:
+            idx = text_lower.find("address")
+            address_match = _ADDRESS_VALUE_RE.match(text, idx + len("address")) if idx >= 0 else None
 
         if address_match:
             account_info["billing_address"] = address_match.group(1).strip()
 
         return account_info
 
-    def _extract_revenue_classification(self, text: str) -> Dict[str, Any]:
+    def _extract_revenue_classification(self, text: str,
+                                        text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Extract revenue classification information
 
         Determines if the contract represents recurring or one-time revenue
@@ -569,29 +893,35 @@ class ContractExtractor:
 
         Args:
             text: Contract text
+            text_lower: text.lower(), when the caller already has it
 
         Returns:
             Dictionary containing revenue classification details
         """
         revenue_info = {}
+        if text_lower is None:
+            text_lower = text.lower()
+
+        is_monthly = "monthly" in text_lower
+        is_quarterly = "quarterly" in text_lower
+        is_annual = "annual" in text_lower
 
         # Check for recurring vs one-time revenue
-        if re.search(r'(?:recurring|subscription|monthly|annual|quarterly)', text, re.IGNORECASE):
+        if is_monthly or is_quarterly or is_annual or "recurring" in text_lower or "subscription" in text_lower:
             revenue_info["type"] = "Recurring"
 
             # Extract billing cycle
-            if re.search(r'monthly', text, re.IGNORECASE):
+            if is_monthly:
                 revenue_info["billing_cycle"] = "Monthly"
-            elif re.search(r'quarterly', text, re.IGNORECASE):
+            elif is_quarterly:
                 revenue_info["billing_cycle"] = "Quarterly"
-            elif re.search(r'annually|annual', text, re.IGNORECASE):
+            elif is_annual:
                 revenue_info["billing_cycle"] = "Annual"
         else:
             revenue_info["type"] = "One-time"
 
-        # Extract renewal terms
-        renewal_pattern = r'(?:renewal|auto-renew|automatically\s*renew)[^\n\.]*'
-        renewal_match = re.search(renewal_pattern, text, re.IGNORECASE)
+        # Extract renewal terms; every alternative of the pattern contains "renew"
+        renewal_match = _RENEWAL_RE.search(text) if "renew" in text_lower else None
 
         if renewal_match:
             revenue_info["renewal_terms"] = renewal_match.group(0)
@@ -599,5 +929,7 @@ class ContractExtractor:
         return revenue_info
 
 
-# Create global extractor instance for use across the application
-extractor = ContractExtractor()
+@cache
+def get_extractor() -> ContractExtractor:
+    """Get the shared extractor instance, creating it on first use"""
+    return ContractExtractor()
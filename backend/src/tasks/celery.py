@@ -1,14 +1,18 @@
 """Celery configuration and async tasks"""
 
 from celery import Celery
+from gridfs.errors import NoFile
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any
 
-from src.core.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
-from src.database.models import get_contracts_collection
-from src.services.extractor import extractor
-from src.core.utils import calculate_score, identify_gaps, get_current_timestamp
+from src.core.config import (
+    CELERY_BROKER_URL, CELERY_RESULT_BACKEND, CELERY_WORKER_POOL, CELERY_WORKER_CONCURRENCY,
+    FAILED_CONTRACT_RETENTION_DAYS
+)
+from src.database.models import get_contracts_collection, get_files_bucket
+from src.services.extractor import get_extractor
+from src.core.utils import analyze_contract, get_current_timestamp, get_current_datetime
 from src.core.exceptions import ProcessingError, ExtractionError
 
 # Configure logging
@@ -40,9 +44,16 @@ celery_app.conf.update(
     # Retry configuration
     task_default_retry_delay=60,  # 1 minute
     task_max_retries=3,
-    # Windows-specific configuration
-    worker_pool='solo',  # Use solo pool for Windows compatibility
-    worker_concurrency=1,  # Single worker for solo pool
+    # Worker pool (prefork, or threads on Windows)
+    worker_pool=CELERY_WORKER_POOL,
+    worker_concurrency=CELERY_WORKER_CONCURRENCY,
+    # Periodic tasks, run by `celery -A src.tasks.celery beat`
+    beat_schedule={
+        'cleanup-old-results': {
+            'task': 'cleanup_old_results',
+            'schedule': timedelta(days=1),
+        },
+    },
 )
 
 
@@ -60,63 +71,54 @@ def parse_contract(self, contract_id: str) -> Dict[str, Any]:
     contracts = get_contracts_collection()
     
     try:
-        logger.info(f"Starting contract parsing for ID: {contract_id}")
+        logger.info("Starting contract parsing for ID: %s", contract_id)
         
-        # Get contract document
-        contract_doc = contracts.find_one({"contract_id": contract_id})
-        if not contract_doc:
+        # Only the GridFS id is needed; the PDF itself lives in the files bucket
+        contract_doc = contracts.find_one({"_id": contract_id}, {"file_id": 1})
+        if contract_doc is None:
             raise ProcessingError(f"Contract {contract_id} not found in database")
         
         # Update status to processing
         contracts.update_one(
-            {"contract_id": contract_id},
+            {"_id": contract_id},
             {
                 "$set": {
                     "status": "processing",
                     "progress": 10,
-                    "updated_at": get_current_timestamp()
+                    "updated_at": get_current_datetime()
                 }
             }
         )
         
-        logger.info(f"Updated contract {contract_id} status to processing")
+        logger.info("Updated contract %s status to processing", contract_id)
         
         # Extract data from PDF
         try:
-            # Update progress
-            contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 30, "updated_at": get_current_timestamp()}}
-            )
-            
-            extracted_data = extractor.extract_data(contract_doc["original_file"])
-            logger.info(f"Successfully extracted data for contract {contract_id}")
+            with get_files_bucket().open_download_stream(contract_doc["file_id"]) as grid_out:
+                file_bytes = grid_out.read()
+            extracted_data = get_extractor().extract_data(file_bytes)
+            # Free the PDF before scoring and storing the results
+            del file_bytes
+            logger.info("Successfully extracted data for contract %s", contract_id)
             
-            # Update progress
+            # Extraction is the slow step; scoring is written with the final result
             contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 60, "updated_at": get_current_timestamp()}}
+                {"_id": contract_id},
+                {"$set": {"progress": 60, "updated_at": get_current_datetime()}}
             )
             
         except ExtractionError as e:
-            logger.error(f"Extraction failed for contract {contract_id}: {str(e)}")
+            logger.error("Extraction failed for contract %s: %s", contract_id, e)
             raise
         
         # Calculate score and gaps
         try:
-            score = calculate_score(extracted_data)
-            gaps = identify_gaps(extracted_data)
-            
-            logger.info(f"Calculated score {score} and found {len(gaps)} gaps for contract {contract_id}")
+            score, gaps = analyze_contract(extracted_data)
             
-            # Update progress
-            contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 80, "updated_at": get_current_timestamp()}}
-            )
+            logger.info("Calculated score %s and found %s gaps for contract %s", score, len(gaps), contract_id)
             
         except Exception as e:
-            logger.error(f"Scoring failed for contract {contract_id}: {str(e)}")
+            logger.error("Scoring failed for contract %s: %s", contract_id, e)
             score = 0
             gaps = []
         
@@ -124,6 +126,7 @@ def parse_contract(self, contract_id: str) -> Dict[str, Any]:
         confidence_scores = _calculate_section_confidence(extracted_data)
         
         # Update contract with extracted data
+        now = get_current_datetime()
         update_data = {
             "status": "completed",
             "progress": 100,
@@ -131,16 +134,16 @@ def parse_contract(self, contract_id: str) -> Dict[str, Any]:
             "score": score,
             "gaps": gaps,
             "confidence_scores": confidence_scores,
-            "processing_completed_at": get_current_timestamp(),
-            "updated_at": get_current_timestamp()
+            "processing_completed_at": now,
+            "updated_at": now
         }
         
         contracts.update_one(
-            {"contract_id": contract_id},
+            {"_id": contract_id},
             {"$set": update_data}
         )
         
-        logger.info(f"Successfully completed processing for contract {contract_id} with score {score}")
+        logger.info("Successfully completed processing for contract %s with score %s", contract_id, score)
         
         return {
             "status": "completed",
@@ -152,34 +155,34 @@ def parse_contract(self, contract_id: str) -> Dict[str, Any]:
         
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Contract parsing failed for {contract_id}: {error_msg}")
+        logger.error("Contract parsing failed for %s: %s", contract_id, error_msg)
         
         # Update contract with error status
         contracts.update_one(
-            {"contract_id": contract_id},
+            {"_id": contract_id},
             {
                 "$set": {
                     "status": "failed",
                     "progress": 0,
                     "error": error_msg,
-                    "updated_at": get_current_timestamp()
+                    "updated_at": get_current_datetime()
                 }
             }
         )
         
         # Retry logic
         if self.request.retries < self.max_retries:
-            logger.info(f"Retrying contract {contract_id} in {self.default_retry_delay} seconds")
+            logger.info("Retrying contract %s in %s seconds", contract_id, self.default_retry_delay)
             raise self.retry(countdown=self.default_retry_delay, exc=e)
         
         # If max retries exceeded, mark as permanently failed
         contracts.update_one(
-            {"contract_id": contract_id},
+            {"_id": contract_id},
             {
                 "$set": {
                     "status": "failed",
                     "error": f"Max retries exceeded: {error_msg}",
-                    "updated_at": get_current_timestamp()
+                    "updated_at": get_current_datetime()
                 }
             }
         )
@@ -187,6 +190,21 @@ def parse_contract(self, contract_id: str) -> Dict[str, Any]:
         raise ProcessingError(f"Contract parsing failed after {self.max_retries} retries: {error_msg}")
 
 
+def run_parse_contract(contract_id: str) -> Dict[str, Any]:
+    """
+    Run parse_contract in the current process, without going through the broker
+    
+    Used by the API's local process pool when a task can't be enqueued.
+    
+    Args:
+        contract_id: Unique identifier for the contract
+        
+    Returns:
+        Dictionary with processing results
+    """
+    return parse_contract.apply(args=(contract_id,)).get(propagate=False)
+
+
 def _calculate_section_confidence(extracted_data: Dict[str, Any]) -> Dict[str, float]:
     """Calculate confidence scores for each section of extracted data"""
     confidence_scores = {}
@@ -252,20 +270,35 @@ def health_check() -> Dict[str, str]:
 
 @celery_app.task(name='cleanup_old_results')
 def cleanup_old_results() -> Dict[str, Any]:
-    """Clean up old processing results and temporary data"""
+    """Clean up old processing results and temporary data
+    
+    Failed contracts past retention are deleted together with their
+    original PDFs in GridFS. Celery beat runs this daily.
+    """
     contracts = get_contracts_collection()
     
     try:
-        # Find contracts older than 30 days with failed status
-        from datetime import datetime, timedelta
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        # Find failed contracts older than the retention period
+        cutoff_date = get_current_datetime() - timedelta(days=FAILED_CONTRACT_RETENTION_DAYS)
+        expired = list(contracts.find(
+            {"status": "failed", "created_at": {"$lt": cutoff_date}},
+            projection={"file_id": 1}
+        ))
+        
+        # Remove the original PDFs before the documents that reference them
+        files = get_files_bucket()
+        for contract in expired:
+            if contract.get("file_id"):
+                try:
+                    files.delete(contract["file_id"])
+                except NoFile:
+                    logger.warning("Original file for contract %s already removed", contract["_id"])
         
         result = contracts.delete_many({
-            "status": "failed",
-            "created_at": {"$lt": cutoff_date.isoformat()}
+            "_id": {"$in": [contract["_id"] for contract in expired]}
         })
         
-        logger.info(f"Cleaned up {result.deleted_count} old failed contracts")
+        logger.info("Cleaned up %s old failed contracts", result.deleted_count)
         
         return {
             "status": "completed",
@@ -274,7 +307,7 @@ def cleanup_old_results() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Cleanup task failed: {str(e)}")
+        logger.error("Cleanup task failed: %s", e)
         return {
             "status": "failed",
             "error": str(e),
@@ -7,15 +7,18 @@ that can be used across all test modules in the project.
 import pytest
 from unittest.mock import MagicMock, patch
 from io import BytesIO
+from types import SimpleNamespace
 
+from pymongo.collection import Collection
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_pdf_content():
     """Sample PDF content for testing"""
     return b'%PDF-1.4\n%Test PDF content for contract intelligence\n%%EOF'
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_contract_text():
     """Sample contract text for extraction testing"""
     return """
@@ -53,18 +56,31 @@ def sample_contract_text():
 @pytest.fixture
 def mock_database_collection():
     """Mock MongoDB collection for testing"""
-    collection = MagicMock()
+    collection = MagicMock(spec=Collection)
     collection.find_one.return_value = None
-    collection.insert_one.return_value = MagicMock(inserted_id="test_id")
-    collection.update_one.return_value = MagicMock(modified_count=1)
-    collection.delete_one.return_value = MagicMock(deleted_count=1)
+    # Operation results only carry values, so plain namespaces stand in for them
+    collection.insert_one.return_value = SimpleNamespace(inserted_id="test_id")
+    collection.update_one.return_value = SimpleNamespace(modified_count=1)
+    collection.delete_one.return_value = SimpleNamespace(deleted_count=1)
     collection.count_documents.return_value = 0
     return collection
 
 
+@pytest.fixture
+def mock_contracts_collection(monkeypatch, mock_database_collection):
+    """Serve mock_database_collection as the Celery tasks' contracts collection"""
+    monkeypatch.setattr("src.tasks.celery.get_contracts_collection", lambda: mock_database_collection)
+    return mock_database_collection
+
+
 @pytest.fixture
 def mock_contract_document():
-    """Mock contract document for testing"""
+    """Mock contract document for testing
+
+    Built fresh for each test, unlike the immutable samples above: handlers
+    modify the documents they load, and a read-only mapping wouldn't
+    serialize like a real one.
+    """
     return {
         "contract_id": "test-contract-123",
         "filename": "test_contract.pdf",
@@ -74,7 +90,7 @@ def mock_contract_document():
         "score": 85,
         "upload_date": "2024-01-01T00:00:00Z",
         "updated_at": "2024-01-01T01:00:00Z",
-        "original_file": b'%PDF-1.4\nTest PDF content\n%%EOF',
+        "file_id": "file-id",
         "extracted_data": {
             "parties": [{"name": "Test Company", "role": "Client"}],
             "financial_details": {"total_value": "$100,000"}
@@ -86,16 +102,21 @@ def mock_contract_document():
 
 
 @pytest.fixture
-def mock_pdfplumber():
-    """Mock pdfplumber for PDF processing tests"""
-    with patch('src.services.extractor.pdfplumber.open') as mock_open:
-        mock_pdf = MagicMock()
+def mock_pymupdf():
+    """Mock PyMuPDF for PDF processing tests"""
+    with patch('pymupdf.open') as mock_open:
+        mock_doc = MagicMock()
         mock_page = MagicMock()
-        mock_page.extract_text.return_value = "Sample contract text"
-        mock_pdf.pages = [mock_page]
-        mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
-        mock_pdf.__exit__ = MagicMock(return_value=None)
-        mock_open.return_value = mock_pdf
+        mock_page.get_text.return_value = [
+            (0.0, 0.0, 40.0, 10.0, "Sample", 0, 0, 0),
+            (50.0, 0.0, 90.0, 10.0, "contract", 0, 0, 1),
+            (100.0, 0.0, 140.0, 10.0, "text", 0, 0, 2),
+        ]
+        mock_doc.__getitem__.side_effect = [mock_page].__getitem__
+        mock_doc.page_count = 1
+        mock_doc.__enter__ = MagicMock(return_value=mock_doc)
+        mock_doc.__exit__ = MagicMock(return_value=None)
+        mock_open.return_value = mock_doc
         yield mock_open
 
 
@@ -103,13 +124,17 @@ def mock_pdfplumber():
 def mock_celery_task():
     """Mock Celery task for testing"""
     task = MagicMock()
-    task.delay.return_value = MagicMock()
+    task.delay.return_value = SimpleNamespace(id="test-task-id")
     return task
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def mock_environment_variables():
-    """Mock environment variables for consistent testing"""
+    """Mock environment variables for consistent testing
+
+    The values never change and no test edits os.environ, so they're set
+    once for the whole session rather than around every test.
+    """
     env_vars = {
         "MONGO_URI": "mongodb://localhost:27017/test_db",
         "REDIS_HOST": "localhost",
@@ -125,9 +150,14 @@ def mock_environment_variables():
         yield
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_client():
-    """Test client for FastAPI testing"""
+    """Test client for FastAPI testing, shared by the whole session
+
+    The app's lifespan isn't entered: tests mock the database getters and
+    set app.state themselves where they need it. The app is imported here,
+    not at module level, so collecting tests doesn't load the API.
+    """
     from fastapi.testclient import TestClient
     from src.main import app
     return TestClient(app)
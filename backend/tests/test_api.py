@@ -13,21 +13,57 @@ database operations and external dependencies.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
-import io
+from unittest.mock import patch, MagicMock, AsyncMock
+import hashlib
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
-from src.main import app
+from pymongo.asynchronous.collection import AsyncCollection
 
-client = TestClient(app)
+
+def make_async_collection():
+    """Build a collection mock mirroring PyMongo's async collection API"""
+    # The spec turns every coroutine method into an AsyncMock and rejects unknown attributes
+    return MagicMock(spec=AsyncCollection)
+
+
+def make_async_cursor(documents):
+    """Build a cursor mock supporting async iteration and to_list()"""
+    cursor = MagicMock()
+    cursor.__aiter__.return_value = documents
+    cursor.to_list = AsyncMock(return_value=documents)
+    return cursor
+
+
+def make_async_bucket():
+    """Build a GridFS bucket mock mirroring AsyncGridFSBucket"""
+    bucket = MagicMock()
+    bucket.open_upload_stream.return_value = AsyncMock()
+    bucket.open_download_stream = AsyncMock()
+    bucket.delete = AsyncMock()
+    return bucket
+
+
+@pytest.fixture
+def mock_async_collection(monkeypatch):
+    """Serve an async collection mock as the routers' contracts collection"""
+    collection = make_async_collection()
+    monkeypatch.setattr("src.api.routers.get_async_contracts_collection", lambda: collection)
+    return collection
 
 
 class TestContractAPI:
     """Test cases for contract API endpoints"""
 
+    @pytest.fixture(autouse=True)
+    def _client(self, test_client):
+        """Share the session's test client with every test"""
+        self.client = test_client
+
     def test_root_endpoint(self):
         """Test root endpoint"""
-        response = client.get("/")
+        response = self.client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
@@ -35,30 +71,29 @@ class TestContractAPI:
 
     def test_health_check(self):
         """Test health check endpoint"""
-        response = client.get("/api/v1/health")
+        response = self.client.get("/api/v1/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert "timestamp" in data
 
-    @patch('src.api.routers.get_contracts_collection')
+    @patch('src.api.routers.get_async_files_bucket')
     @patch('src.api.routers.parse_contract')
-    def test_upload_contract_success(self, mock_parse_contract, mock_get_collection):
+    def test_upload_contract_success(self, mock_parse_contract, mock_get_bucket,
+                                     mock_async_collection, sample_pdf_content):
         """Test successful contract upload"""
-        # Mock database collection
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
+        mock_bucket = make_async_bucket()
+        mock_grid_in = mock_bucket.open_upload_stream.return_value
+        mock_grid_in._id = "file-id"
+        mock_get_bucket.return_value = mock_bucket
         
         # Mock celery task
-        mock_parse_contract.delay.return_value = MagicMock()
-        
-        # Create test PDF file
-        pdf_content = b'%PDF-1.4\n%Test PDF content\n%%EOF'
+        mock_parse_contract.delay.return_value = SimpleNamespace(id="test-task-id")
         
         # Upload file
-        response = client.post(
+        response = self.client.post(
             "/api/v1/contracts/upload",
-            files={"file": ("test.pdf", io.BytesIO(pdf_content), "application/pdf")}
+            files={"file": ("test.pdf", sample_pdf_content, "application/pdf")}
         )
         
         assert response.status_code == 200
@@ -66,40 +101,118 @@ class TestContractAPI:
         assert "contract_id" in data
         assert data["filename"] == "test.pdf"
         
-        # Verify database insert was called
-        mock_collection.insert_one.assert_called_once()
+        # Verify the file was streamed to GridFS and only its id was stored
+        mock_bucket.open_upload_stream.assert_called_once_with("test.pdf")
+        mock_grid_in.write.assert_called_once_with(sample_pdf_content)
+        mock_grid_in.close.assert_called_once()
+        mock_async_collection.insert_one.assert_called_once()
+        stored_doc = mock_async_collection.insert_one.call_args[0][0]
+        assert stored_doc["file_id"] == "file-id"
+        # The contract id doubles as the document's primary key
+        assert stored_doc["_id"] == stored_doc["contract_id"] == data["contract_id"]
+        # A single native datetime is shared by all upload timestamps
+        assert isinstance(stored_doc["upload_date"], datetime)
+        assert stored_doc["upload_date"] == stored_doc["created_at"] == stored_doc["updated_at"]
+        assert "original_file" not in stored_doc
+        assert stored_doc["etag"] == hashlib.sha1(sample_pdf_content).hexdigest()
         # Verify celery task was started
         mock_parse_contract.delay.assert_called_once()
 
-    def test_upload_invalid_file_type(self):
-        """Test upload with invalid file type"""
-        # Create test text file
-        txt_content = b'This is not a PDF file'
+    @patch('src.api.routers.get_async_files_bucket')
+    @patch('src.api.routers.parse_contract')
+    def test_upload_removes_file_when_insert_fails(self, mock_parse_contract, mock_get_bucket,
+                                                   mock_async_collection, sample_pdf_content):
+        """Test a failed metadata insert deletes the PDF already stored in GridFS"""
+        mock_bucket = make_async_bucket()
+        mock_bucket.open_upload_stream.return_value._id = "file-id"
+        mock_get_bucket.return_value = mock_bucket
+        mock_async_collection.insert_one.side_effect = Exception("Write concern error")
+        
+        response = self.client.post(
+            "/api/v1/contracts/upload",
+            files={"file": ("test.pdf", sample_pdf_content, "application/pdf")}
+        )
         
-        response = client.post(
+        assert response.status_code == 503
+        mock_bucket.delete.assert_awaited_once_with("file-id")
+        mock_parse_contract.delay.assert_not_called()
+
+    @patch('src.api.routers.run_parse_contract')
+    @patch('src.api.routers.get_async_files_bucket')
+    @patch('src.api.routers.get_async_contracts_collection')
+    @patch('src.api.routers.parse_contract')
+    def test_upload_falls_back_to_local_pool(self, mock_parse_contract, mock_get_collection,
+                                             mock_get_bucket, mock_run_parse_contract,
+                                             sample_pdf_content):
+        """Test contracts are parsed in the app's pool when Celery is unreachable"""
+        mock_get_collection.return_value = make_async_collection()
+        mock_get_bucket.return_value = make_async_bucket()
+        mock_parse_contract.delay.side_effect = Exception("Broker unavailable")
+        pool = ThreadPoolExecutor(max_workers=1)
+        app = self.client.app
+        app.state.extractor_pool = pool
+        
+        try:
+            response = self.client.post(
+                "/api/v1/contracts/upload",
+                files={"file": ("test.pdf", sample_pdf_content, "application/pdf")}
+            )
+        finally:
+            del app.state.extractor_pool
+            pool.shutdown(wait=True)
+        
+        assert response.status_code == 200
+        mock_run_parse_contract.assert_called_once_with(response.json()["contract_id"])
+
+    @patch('src.api.routers.MAX_FILE_SIZE', 16)
+    @patch('src.api.routers.get_async_files_bucket')
+    @patch('src.api.routers.get_async_contracts_collection')
+    def test_upload_file_too_large_rejected_before_storage(self, mock_get_collection, mock_get_bucket,
+                                                           sample_pdf_content):
+        """Test oversized upload is rejected before anything is stored"""
+        response = self.client.post(
             "/api/v1/contracts/upload",
-            files={"file": ("test.txt", io.BytesIO(txt_content), "text/plain")}
+            files={"file": ("test.pdf", sample_pdf_content, "application/pdf")}
         )
         
         assert response.status_code == 400
-        assert "Only PDF files are supported" in response.json()["detail"]
+        assert "File size exceeds maximum limit" in response.json()["detail"]
+        mock_get_bucket.assert_not_called()
+        mock_get_collection.assert_not_called()
 
-    def test_upload_empty_file(self):
-        """Test upload with empty file"""
-        response = client.post(
+    @pytest.mark.parametrize("filename,content,content_type,detail", [
+        ("test.txt", b'This is not a PDF file', "text/plain", "Only PDF files are supported"),
+        ("empty.pdf", b'', "application/pdf", "File is empty"),
+    ])
+    def test_upload_rejected(self, filename, content, content_type, detail):
+        """Test upload with an invalid file type or an empty file"""
+        response = self.client.post(
             "/api/v1/contracts/upload",
-            files={"file": ("empty.pdf", io.BytesIO(b''), "application/pdf")}
+            files={"file": (filename, content, content_type)}
         )
         
         assert response.status_code == 400
-        assert "File is empty" in response.json()["detail"]
+        assert detail in response.json()["detail"]
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_get_contract_status_found(self, mock_get_collection):
-        """Test get contract status - found"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
+    @patch('src.api.routers.get_async_files_bucket')
+    @patch('src.api.routers.get_async_contracts_collection')
+    @patch('src.api.routers.parse_contract')
+    def test_upload_non_pdf_rejected_before_storage(self, mock_parse_contract,
+                                                    mock_get_collection, mock_get_bucket):
+        """Test a .pdf without PDF magic bytes never reaches Mongo or Celery"""
+        response = self.client.post(
+            "/api/v1/contracts/upload",
+            files={"file": ("fake.pdf", b'PK\x03\x04 not a pdf', "application/pdf")}
+        )
         
+        assert response.status_code == 400
+        assert "File is not a valid PDF" in response.json()["detail"]
+        mock_get_bucket.assert_not_called()
+        mock_get_collection.assert_not_called()
+        mock_parse_contract.delay.assert_not_called()
+
+    def test_get_contract_status_found(self, mock_async_collection):
+        """Test get contract status - found"""
         # Mock contract data
         mock_contract = {
             "contract_id": "test-id",
@@ -108,34 +221,37 @@ class TestContractAPI:
             "filename": "test.pdf",
             "upload_date": "2024-01-01T00:00:00"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_async_collection.find_one.return_value = mock_contract
         
-        response = client.get("/api/v1/contracts/test-id/status")
+        response = self.client.get("/api/v1/contracts/test-id/status")
         
         assert response.status_code == 200
         data = response.json()
         assert data["contract_id"] == "test-id"
+        assert mock_async_collection.find_one.call_args[0][0] == {"_id": "test-id"}
         assert data["status"] == "completed"
         assert data["progress"] == 100
+        # Only the fields the response needs are fetched
+        projection = mock_async_collection.find_one.call_args[0][1]
+        assert projection["_id"] == 0
+        assert "extracted_data" not in projection
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_get_contract_status_not_found(self, mock_get_collection):
-        """Test get contract status - not found"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        mock_collection.find_one.return_value = None
+    @pytest.mark.parametrize("method,path,lookup", [
+        ("GET", "/api/v1/contracts/nonexistent-id/status", "find_one"),
+        ("GET", "/api/v1/contracts/nonexistent-id/download", "find_one"),
+        ("DELETE", "/api/v1/contracts/nonexistent-id", "find_one_and_delete"),
+    ])
+    def test_contract_not_found(self, method, path, lookup, mock_async_collection):
+        """Test status, download and delete of an unknown contract"""
+        getattr(mock_async_collection, lookup).return_value = None
         
-        response = client.get("/api/v1/contracts/nonexistent-id/status")
+        response = self.client.request(method, path)
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_get_contract_data_completed(self, mock_get_collection):
+    def test_get_contract_data_completed(self, mock_async_collection):
         """Test get contract data - completed"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
         # Mock completed contract data
         mock_contract = {
             "contract_id": "test-id",
@@ -145,9 +261,9 @@ class TestContractAPI:
             "gaps": [],
             "confidence_scores": {"parties": 90}
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_async_collection.find_one.return_value = mock_contract
         
-        response = client.get("/api/v1/contracts/test-id")
+        response = self.client.get("/api/v1/contracts/test-id")
         
         assert response.status_code == 200
         data = response.json()
@@ -155,30 +271,22 @@ class TestContractAPI:
         assert data["score"] == 85
         assert "extracted_data" in data
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_get_contract_data_not_completed(self, mock_get_collection):
+    def test_get_contract_data_not_completed(self, mock_async_collection):
         """Test get contract data - not completed"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
         # Mock processing contract
         mock_contract = {
             "contract_id": "test-id",
             "status": "processing"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_async_collection.find_one.return_value = mock_contract
         
-        response = client.get("/api/v1/contracts/test-id")
+        response = self.client.get("/api/v1/contracts/test-id")
         
         assert response.status_code == 400
         assert "not completed" in response.json()["detail"]
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_list_contracts(self, mock_get_collection):
+    def test_list_contracts(self, mock_async_collection):
         """Test list contracts"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
         # Mock contract list
         mock_contracts = [
             {
@@ -187,128 +295,160 @@ class TestContractAPI:
                 "status": "completed",
                 "progress": 100,
                 "score": 85,
-                "gaps": []
+                "gaps_count": 0
             },
             {
                 "contract_id": "test-2",
                 "filename": "test2.pdf",
                 "status": "processing",
                 "progress": 50,
-                "gaps": []
+                "gaps_count": 0
             }
         ]
         
-        mock_collection.count_documents.return_value = 2
-        mock_collection.find.return_value.sort.return_value.skip.return_value.limit.return_value = mock_contracts
+        mock_async_collection.aggregate.return_value = make_async_cursor([
+            {"page": mock_contracts, "total": [{"n": 2}]}
+        ])
         
-        response = client.get("/api/v1/contracts")
+        response = self.client.get("/api/v1/contracts")
         
         assert response.status_code == 200
         data = response.json()
         assert len(data["contracts"]) == 2
         assert "pagination" in data
         assert data["pagination"]["total_count"] == 2
+        # Page and count come from a single aggregation round-trip
+        mock_async_collection.aggregate.assert_called_once()
+        mock_async_collection.count_documents.assert_not_called()
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_list_contracts_with_status_filter(self, mock_get_collection):
+    def test_list_contracts_with_status_filter(self, mock_async_collection):
         """Test list contracts with status filter"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
+        mock_async_collection.aggregate.return_value = make_async_cursor([{"page": [], "total": []}])
         
-        mock_collection.count_documents.return_value = 1
-        mock_collection.find.return_value.sort.return_value.skip.return_value.limit.return_value = []
-        
-        response = client.get("/api/v1/contracts?status=completed")
+        response = self.client.get("/api/v1/contracts?status=completed")
         
         assert response.status_code == 200
-        # Verify the collection was queried with status filter
-        mock_collection.find.assert_called_with({"status": "completed"}, {"original_file": 0})
+        assert response.json()["pagination"]["total_count"] == 0
+        # Verify the pipeline starts by filtering on status
+        pipeline = mock_async_collection.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"status": "completed"}}
 
-    def test_list_contracts_invalid_status(self):
-        """Test list contracts with invalid status filter"""
-        response = client.get("/api/v1/contracts?status=invalid")
+    @pytest.mark.parametrize("query,detail", [
+        ("sort_by=filename", "Invalid sort field"),
+        ("status=invalid", "Invalid status filter"),
+    ])
+    def test_list_contracts_rejected(self, query, detail):
+        """Test list contracts with a non-indexed sort field or invalid status filter"""
+        response = self.client.get(f"/api/v1/contracts?{query}")
         
         assert response.status_code == 400
-        assert "Invalid status filter" in response.json()["detail"]
+        assert detail in response.json()["detail"]
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_download_contract_success(self, mock_get_collection):
+    @patch('src.api.routers.get_async_files_bucket')
+    def test_download_contract_success(self, mock_get_bucket, mock_async_collection,
+                                       sample_pdf_content):
         """Test download contract - success"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
-        # Mock contract with file data
-        pdf_content = b'%PDF-1.4\nTest PDF content\n%%EOF'
+        # Mock contract referencing a GridFS file
         mock_contract = {
             "contract_id": "test-id",
             "filename": "test.pdf",
-            "original_file": pdf_content
+            "file_id": "file-id"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_async_collection.find_one.return_value = mock_contract
         
-        response = client.get("/api/v1/contracts/test-id/download")
+        grid_out = AsyncMock()
+        grid_out.length = len(sample_pdf_content)
+        grid_out.readchunk.side_effect = [sample_pdf_content[:10], sample_pdf_content[10:], b""]
+        mock_get_bucket.return_value = make_async_bucket()
+        mock_get_bucket.return_value.open_download_stream.return_value = grid_out
+        
+        response = self.client.get("/api/v1/contracts/test-id/download")
         
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
         assert "attachment" in response.headers["content-disposition"]
+        assert response.content == sample_pdf_content
+        mock_get_bucket.return_value.open_download_stream.assert_called_once_with("file-id")
+        grid_out.close.assert_called_once()
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_download_contract_not_found(self, mock_get_collection):
-        """Test download contract - not found"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        mock_collection.find_one.return_value = None
+    @patch('src.api.routers.get_async_files_bucket')
+    def test_download_contract_not_modified(self, mock_get_bucket, mock_async_collection):
+        """Test download revalidation with a matching If-None-Match"""
+        mock_get_bucket.return_value = make_async_bucket()
+        mock_async_collection.find_one.return_value = {
+            "filename": "test.pdf",
+            "file_id": "file-id",
+            "file_size": 1024,
+            "etag": "abc123"
+        }
         
-        response = client.get("/api/v1/contracts/nonexistent-id/download")
+        response = self.client.get(
+            "/api/v1/contracts/test-id/download",
+            headers={"If-None-Match": '"abc123"'}
+        )
         
-        assert response.status_code == 404
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123"'
+        mock_get_bucket.return_value.open_download_stream.assert_not_called()
+
+    @patch('src.api.routers.get_async_files_bucket')
+    def test_head_download_contract(self, mock_get_bucket, mock_async_collection):
+        """Test HEAD on download returns headers without opening the file"""
+        mock_get_bucket.return_value = make_async_bucket()
+        mock_async_collection.find_one.return_value = {
+            "filename": "test.pdf",
+            "file_id": "file-id",
+            "file_size": 1024,
+            "etag": "abc123"
+        }
+        
+        response = self.client.head("/api/v1/contracts/test-id/download")
+        
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["content-length"] == "1024"
+        assert response.content == b""
+        mock_get_bucket.return_value.open_download_stream.assert_not_called()
+        
+        # HEAD revalidates like GET
+        response = self.client.head(
+            "/api/v1/contracts/test-id/download",
+            headers={"If-None-Match": '"abc123"'}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc123"'
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_delete_contract_success(self, mock_get_collection):
+    @patch('src.api.routers.get_async_files_bucket')
+    def test_delete_contract_success(self, mock_get_bucket, mock_async_collection):
         """Test delete contract - success"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
+        mock_get_bucket.return_value = make_async_bucket()
         
         # Mock successful deletion
-        mock_result = MagicMock()
-        mock_result.deleted_count = 1
-        mock_collection.delete_one.return_value = mock_result
+        mock_async_collection.find_one_and_delete.return_value = {
+            "contract_id": "test-id",
+            "file_id": "file-id"
+        }
         
-        response = client.delete("/api/v1/contracts/test-id")
+        response = self.client.delete("/api/v1/contracts/test-id")
         
         assert response.status_code == 200
         data = response.json()
         assert "deleted successfully" in data["message"]
+        # The original PDF is removed from GridFS as well
+        mock_get_bucket.return_value.delete.assert_called_once_with("file-id")
 
-    @patch('src.api.routers.get_contracts_collection')
-    def test_delete_contract_not_found(self, mock_get_collection):
-        """Test delete contract - not found"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
-        # Mock no deletion (not found)
-        mock_result = MagicMock()
-        mock_result.deleted_count = 0
-        mock_collection.delete_one.return_value = mock_result
-        
-        response = client.delete("/api/v1/contracts/nonexistent-id")
-        
-        assert response.status_code == 404
-
-    @patch('src.api.routers.get_contracts_collection')
-    def test_get_statistics(self, mock_get_collection):
+    def test_get_statistics(self, mock_async_collection):
         """Test get contract statistics"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        
-        # Mock statistics data
-        mock_collection.count_documents.side_effect = [100, 80]  # total, completed
-        mock_collection.aggregate.side_effect = [
-            [{"_id": "completed", "count": 80}, {"_id": "processing", "count": 20}],  # status stats
-            [{"_id": None, "avg_score": 85.5}]  # average score
-        ]
+        from src.api import routers
+        routers._invalidate_stats_cache()
+        
+        # Mock statistics data ($facet returns a single document)
+        mock_async_collection.aggregate.return_value = make_async_cursor([{
+            "by_status": [{"_id": "completed", "count": 80}, {"_id": "processing", "count": 20}],
+            "completed": [{"_id": None, "count": 80, "avg_score": 85.5}]
+        }])
         
-        response = client.get("/api/v1/contracts/stats")
+        response = self.client.get("/api/v1/contracts/stats")
         
         assert response.status_code == 200
         data = response.json()
@@ -316,6 +456,45 @@ class TestContractAPI:
         assert data["completed_contracts"] == 80
         assert data["completion_rate"] == 80.0
         assert data["average_score"] == 85.5
+        assert data["status_breakdown"] == {"completed": 80, "processing": 20}
+        # All statistics come from a single aggregation round-trip
+        mock_async_collection.aggregate.assert_called_once()
+        mock_async_collection.count_documents.assert_not_called()
+
+    def test_get_statistics_cached(self, mock_async_collection):
+        """Test statistics are served from cache and revalidated via ETag"""
+        from src.api import routers
+        routers._invalidate_stats_cache()
+        mock_async_collection.aggregate.side_effect = lambda pipeline: make_async_cursor([{
+            "by_status": [{"_id": "completed", "count": 1}],
+            "completed": [{"_id": None, "count": 1, "avg_score": 90}]
+        }])
+        
+        first = self.client.get("/api/v1/contracts/stats")
+        second = self.client.get("/api/v1/contracts/stats")
+        
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert "max-age" in first.headers["cache-control"]
+        mock_async_collection.aggregate.assert_called_once()
+        
+        # Matching ETag short-circuits with 304
+        response = self.client.get(
+            "/api/v1/contracts/stats",
+            headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 304
+        
+        # Deleting a contract invalidates the cache
+        mock_async_collection.find_one_and_delete.return_value = {"contract_id": "test-id"}
+        self.client.delete("/api/v1/contracts/test-id")
+        # Unchanged counts keep the ETag across the recompute
+        response = self.client.get(
+            "/api/v1/contracts/stats",
+            headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 304
+        assert mock_async_collection.aggregate.call_count == 2
 
 
 if __name__ == "__main__":
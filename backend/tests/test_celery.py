@@ -5,124 +5,130 @@ including contract parsing tasks, health checks, and cleanup operations.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, DEFAULT
+from types import SimpleNamespace
 from datetime import datetime
+from gridfs.errors import NoFile
 
 from src.tasks.celery import (
     parse_contract, health_check, cleanup_old_results,
     _calculate_section_confidence, celery_app
 )
+from src.core.config import CELERY_WORKER_POOL, CELERY_WORKER_CONCURRENCY
 from src.core.exceptions import ProcessingError, ExtractionError
 
+CONTRACT_ID = "test-contract-123"
+
+PARTIAL_EXTRACTED_DATA = {
+    "parties": [{"name": "Test Company", "confidence": 95}],
+    "financial_details": {"total_value": "$50,000"}
+}
+
+
+@pytest.fixture(scope="class")
+def sample_extracted_data():
+    """Extracted data shared by the tests that need it (read-only)"""
+    return {
+        "parties": [
+            {"name": "Test Company", "role": "Client", "confidence": 90}
+        ],
+        "financial_details": {
+            "total_value": "$100,000",
+            "currency": "USD"
+        },
+        "payment_structure": {
+            "terms": "Net 30",
+            "method": "Wire Transfer"
+        },
+        "sla_terms": {
+            "response_time": "4 hours",
+            "uptime_guarantee": "99.9%"
+        },
+        "contact_information": {
+            "emails": ["test@company.com"]
+        },
+        "account_information": {
+            "account_number": "ACC-123"
+        }
+    }
+
 
 class TestCeleryTasks:
     """Test cases for Celery task functionality"""
 
-    def setup_method(self):
-        """Set up test environment before each test"""
-        self.contract_id = "test-contract-123"
-        self.sample_extracted_data = {
-            "parties": [
-                {"name": "Test Company", "role": "Client", "confidence": 90}
-            ],
-            "financial_details": {
-                "total_value": "$100,000",
-                "currency": "USD"
-            },
-            "payment_structure": {
-                "terms": "Net 30",
-                "method": "Wire Transfer"
-            },
-            "sla_terms": {
-                "response_time": "4 hours",
-                "uptime_guarantee": "99.9%"
-            },
-            "contact_information": {
-                "emails": ["test@company.com"]
-            },
-            "account_information": {
-                "account_number": "ACC-123"
-            }
-        }
-
-    @patch('src.tasks.celery.get_contracts_collection')
-    @patch('src.tasks.celery.extractor')
-    @patch('src.tasks.celery.calculate_score')
-    @patch('src.tasks.celery.identify_gaps')
-    def test_parse_contract_success(self, mock_identify_gaps, mock_calculate_score,
-                                   mock_extractor, mock_get_collection):
+    def test_parse_contract_success(self, sample_extracted_data, mock_contracts_collection):
         """Test successful contract parsing task"""
-        # Mock database collection
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-
         # Mock contract document
         mock_contract = {
-            "contract_id": self.contract_id,
-            "original_file": b"fake pdf content",
+            "contract_id": CONTRACT_ID,
+            "file_id": "file-id",
             "status": "pending"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_contracts_collection.find_one.return_value = mock_contract
 
-        # Mock extractor
-        mock_extractor.extract_data.return_value = self.sample_extracted_data
+        with patch.multiple('src.tasks.celery', get_files_bucket=DEFAULT,
+                            get_extractor=DEFAULT, analyze_contract=DEFAULT) as mocks:
+            # Mock extractor
+            mocks['get_extractor'].return_value.extract_data.return_value = sample_extracted_data
 
-        # Mock scoring functions
-        mock_calculate_score.return_value = 85
-        mock_identify_gaps.return_value = []
+            # Mock scoring
+            mocks['analyze_contract'].return_value = (85, [])
 
-        # Execute task
-        result = parse_contract(self.contract_id)
+            # Execute task
+            result = parse_contract(CONTRACT_ID)
 
         # Verify database operations
-        assert mock_collection.find_one.call_count == 1
-        assert mock_collection.update_one.call_count == 3  # status updates
+        mock_contracts_collection.find_one.assert_called_once_with(
+            {"_id": CONTRACT_ID}, {"file_id": 1}
+        )
+        assert mock_contracts_collection.update_one.call_count == 3  # status updates
+
+        # The PDF is read from GridFS and the download stream closed
+        grid_out = mocks['get_files_bucket'].return_value.open_download_stream.return_value
+        mocks['get_extractor'].return_value.extract_data.assert_called_once_with(
+            grid_out.__enter__.return_value.read.return_value
+        )
+        grid_out.__exit__.assert_called_once()
 
         # Verify result
         assert result["status"] == "completed"
-        assert result["contract_id"] == self.contract_id
+        assert result["contract_id"] == CONTRACT_ID
         assert result["score"] == 85
         assert result["gaps_count"] == 0
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    def test_parse_contract_not_found(self, mock_get_collection):
+    def test_parse_contract_not_found(self, mock_contracts_collection):
         """Test contract parsing when contract is not found"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-        mock_collection.find_one.return_value = None
+        mock_contracts_collection.find_one.return_value = None
 
         with pytest.raises(ProcessingError):
-            parse_contract(self.contract_id)
+            parse_contract(CONTRACT_ID)
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    @patch('src.tasks.celery.extractor')
-    def test_parse_contract_extraction_failure(self, mock_extractor, mock_get_collection):
+    @patch('src.tasks.celery.get_files_bucket')
+    @patch('src.tasks.celery.get_extractor')
+    def test_parse_contract_extraction_failure(self, mock_get_extractor, mock_get_bucket,
+                                               mock_contracts_collection):
         """Test contract parsing when extraction fails"""
-        # Mock database collection
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-
         # Mock contract document
         mock_contract = {
-            "contract_id": self.contract_id,
-            "original_file": b"fake pdf content",
+            "contract_id": CONTRACT_ID,
+            "file_id": "file-id",
             "status": "pending"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_contracts_collection.find_one.return_value = mock_contract
 
         # Mock extractor to raise exception
-        mock_extractor.extract_data.side_effect = ExtractionError("PDF extraction failed")
+        mock_get_extractor.return_value.extract_data.side_effect = ExtractionError("PDF extraction failed")
 
         # Execute task and expect it to handle the error gracefully
-        result = parse_contract(self.contract_id)
+        result = parse_contract(CONTRACT_ID)
 
         # Verify error handling
         assert result is not None  # Task should complete (not raise exception)
         # The task should have updated the contract status to failed
 
-    def test_calculate_section_confidence_complete_data(self):
+    def test_calculate_section_confidence_complete_data(self, sample_extracted_data):
         """Test confidence calculation with complete extracted data"""
-        confidence_scores = _calculate_section_confidence(self.sample_extracted_data)
+        confidence_scores = _calculate_section_confidence(sample_extracted_data)
 
         # Verify all sections have confidence scores
         assert "parties" in confidence_scores
@@ -144,18 +150,34 @@ class TestCeleryTasks:
 
     def test_calculate_section_confidence_partial_data(self):
         """Test confidence calculation with partial data"""
-        partial_data = {
-            "parties": [{"name": "Test Company", "confidence": 95}],
-            "financial_details": {"total_value": "$50,000"}
-        }
-
-        confidence_scores = _calculate_section_confidence(partial_data)
+        confidence_scores = _calculate_section_confidence(PARTIAL_EXTRACTED_DATA)
 
         # Should only include sections that exist
         assert "parties" in confidence_scores
         assert "financial_details" in confidence_scores
         assert len(confidence_scores) == 2
 
+    @pytest.mark.benchmark(group="section-confidence", disable_gc=True)
+    @pytest.mark.parametrize("case, expected", [
+        ("complete", {"parties": 90.0}),
+        ("empty", {}),
+        ("partial", {"parties": 95.0}),
+    ])
+    def test_calculate_section_confidence_benchmark(self, benchmark, case, expected,
+                                                    sample_extracted_data):
+        """Benchmark confidence calculation (a single call unless run with --benchmark-enable)"""
+        data = {
+            "complete": sample_extracted_data,
+            "empty": {},
+            "partial": PARTIAL_EXTRACTED_DATA,
+        }[case]
+
+        confidence_scores = benchmark.pedantic(
+            _calculate_section_confidence, args=(data,), rounds=50, iterations=100
+        )
+
+        assert confidence_scores == expected
+
     def test_health_check_task(self):
         """Test health check task execution"""
         result = health_check()
@@ -167,36 +189,43 @@ class TestCeleryTasks:
 
         # Verify timestamp format
         try:
-            datetime.fromisoformat(result["timestamp"].replace('Z', '+00:00'))
+            datetime.fromisoformat(result["timestamp"])
         except ValueError:
             pytest.fail("Health check timestamp is not in valid ISO format")
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    def test_cleanup_old_results_success(self, mock_get_collection):
+    @patch('src.tasks.celery.get_files_bucket')
+    def test_cleanup_old_results_success(self, mock_get_bucket, mock_contracts_collection):
         """Test successful cleanup of old results"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-
-        # Mock cleanup operation
-        mock_result = MagicMock()
-        mock_result.deleted_count = 5
-        mock_collection.delete_many.return_value = mock_result
+        # Mock cleanup operation; one PDF is already gone from GridFS
+        mock_contracts_collection.find.return_value = [
+            {"_id": "expired-1", "file_id": "file-1"},
+            {"_id": "expired-2", "file_id": "file-2"},
+        ]
+        mock_get_bucket.return_value.delete.side_effect = [None, NoFile("missing")]
+        mock_contracts_collection.delete_many.return_value = SimpleNamespace(deleted_count=2)
 
         result = cleanup_old_results()
 
+        # Cutoff is compared as a native datetime
+        query = mock_contracts_collection.find.call_args[0][0]
+        assert query["status"] == "failed"
+        assert isinstance(query["created_at"]["$lt"], datetime)
+
+        # Each PDF is removed along with the document referencing it
+        assert [call.args[0] for call in mock_get_bucket.return_value.delete.call_args_list] == ["file-1", "file-2"]
+        mock_contracts_collection.delete_many.assert_called_once_with(
+            {"_id": {"$in": ["expired-1", "expired-2"]}}
+        )
+
         # Verify cleanup result
         assert result["status"] == "completed"
-        assert result["deleted_count"] == 5
+        assert result["deleted_count"] == 2
         assert "timestamp" in result
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    def test_cleanup_old_results_failure(self, mock_get_collection):
+    def test_cleanup_old_results_failure(self, mock_contracts_collection):
         """Test cleanup task failure handling"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-
         # Mock database error
-        mock_collection.delete_many.side_effect = Exception("Database connection failed")
+        mock_contracts_collection.find.side_effect = Exception("Database connection failed")
 
         result = cleanup_old_results()
 
@@ -205,24 +234,21 @@ class TestCeleryTasks:
         assert "error" in result
         assert "timestamp" in result
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    @patch('src.tasks.celery.extractor')
-    def test_parse_contract_retry_logic(self, mock_extractor, mock_get_collection):
+    @patch('src.tasks.celery.get_files_bucket')
+    @patch('src.tasks.celery.get_extractor')
+    def test_parse_contract_retry_logic(self, mock_get_extractor, mock_get_bucket,
+                                        mock_contracts_collection):
         """Test retry logic when task fails"""
-        # Mock database collection
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
-
         # Mock contract document
         mock_contract = {
-            "contract_id": self.contract_id,
-            "original_file": b"fake pdf content",
+            "contract_id": CONTRACT_ID,
+            "file_id": "file-id",
             "status": "pending"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_contracts_collection.find_one.return_value = mock_contract
 
         # Mock extractor to always fail
-        mock_extractor.extract_data.side_effect = Exception("Persistent extraction error")
+        mock_get_extractor.return_value.extract_data.side_effect = Exception("Persistent extraction error")
 
         # Create a mock task with retry attributes
         task_mock = MagicMock()
@@ -231,7 +257,7 @@ class TestCeleryTasks:
 
         # Execute task with retry context
         with patch('src.tasks.celery.parse_contract.request', task_mock.request):
-            result = parse_contract(self.contract_id)
+            result = parse_contract(CONTRACT_ID)
 
         # Task should complete (not raise exception due to retry logic)
         assert result is not None
@@ -244,6 +270,8 @@ class TestCeleryTasks:
         assert celery_app.conf['result_serializer'] == 'json'
         assert celery_app.conf['enable_utc'] is True
         assert celery_app.conf['task_track_started'] is True
+        assert celery_app.conf['worker_pool'] == CELERY_WORKER_POOL
+        assert celery_app.conf['worker_concurrency'] == CELERY_WORKER_CONCURRENCY
 
     def test_task_routing(self):
         """Test task routing configuration"""
@@ -251,30 +279,31 @@ class TestCeleryTasks:
         routes = celery_app.conf.get('task_routes', {})
         assert 'src.tasks.celery.parse_contract' in routes
 
-    @patch('src.tasks.celery.get_contracts_collection')
-    def test_parse_contract_progress_updates(self, mock_get_collection):
-        """Test that contract parsing updates progress correctly"""
-        mock_collection = MagicMock()
-        mock_get_collection.return_value = mock_collection
+    def test_cleanup_scheduled_with_beat(self):
+        """Test cleanup_old_results runs on the beat schedule"""
+        tasks = [entry['task'] for entry in celery_app.conf['beat_schedule'].values()]
+        assert 'cleanup_old_results' in tasks
 
+    def test_parse_contract_progress_updates(self, sample_extracted_data, mock_contracts_collection):
+        """Test that contract parsing updates progress correctly"""
         # Mock contract document
         mock_contract = {
-            "contract_id": self.contract_id,
-            "original_file": b"fake pdf content",
+            "contract_id": CONTRACT_ID,
+            "file_id": "file-id",
             "status": "pending"
         }
-        mock_collection.find_one.return_value = mock_contract
+        mock_contracts_collection.find_one.return_value = mock_contract
 
         # Mock successful extraction
-        with patch('src.tasks.celery.extractor') as mock_extractor:
-            mock_extractor.extract_data.return_value = self.sample_extracted_data
+        with patch.multiple('src.tasks.celery', get_files_bucket=DEFAULT,
+                            get_extractor=DEFAULT, analyze_contract=DEFAULT) as mocks:
+            mocks['get_extractor'].return_value.extract_data.return_value = sample_extracted_data
+            mocks['analyze_contract'].return_value = (85, [])
 
-            with patch('src.tasks.celery.calculate_score', return_value=85):
-                with patch('src.tasks.celery.identify_gaps', return_value=[]):
-                    parse_contract(self.contract_id)
+            parse_contract(CONTRACT_ID)
 
         # Verify progress updates were called
-        progress_calls = [call for call in mock_collection.update_one.call_args_list
+        progress_calls = [call for call in mock_contracts_collection.update_one.call_args_list
                          if 'progress' in str(call)]
         assert len(progress_calls) >= 3  # At least 3 progress updates
 
@@ -16,21 +16,19 @@ Tests use realistic contract text samples and mock PDF processing
 to ensure robust extraction capabilities.
 """
 
+import re
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import pymupdf
 
-from src.services.extractor import ContractExtractor
+from src.services.extractor import ContractExtractor, _ADDRESS_RE, _EntityNameScanner, _page_text
 from src.core.exceptions import ExtractionError
 
 
-class TestContractExtractor:
-    """Test cases for contract extraction functionality"""
-
-    def setup_method(self):
-        """Set up test cases"""
-        self.extractor = ContractExtractor()
-        self.sample_contract_text = """
+SAMPLE_CONTRACT_TEXT = """
         SERVICE AGREEMENT
         
         This agreement is between TechCorp Solutions Inc. (Service Provider) 
@@ -57,39 +55,107 @@ class TestContractExtractor:
         This is a recurring monthly service agreement.
         """
 
-    @patch('src.services.extractor.pdfplumber.open')
-    def test_extract_text_from_pdf_success(self, mock_pdfplumber):
+# Placeholder PDF bytes for tests that mock the parsing
+PDF_BYTES = b'%PDF-1.4\nTest content\n%%EOF'
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    """One extractor for the module; the tests only read from it"""
+    return ContractExtractor()
+
+
+class TestContractExtractor:
+    """Test cases for contract extraction functionality"""
+
+    @pytest.fixture(autouse=True)
+    def _extractor(self, extractor):
+        """Share the module's extractor with every test"""
+        self.extractor = extractor
+
+    def test_extract_text_and_pagecount_success(self, mock_pymupdf):
         """Test successful text extraction from PDF"""
-        # Mock pdfplumber
-        mock_pdf = MagicMock()
-        mock_page = MagicMock()
-        mock_page.extract_text.return_value = self.sample_contract_text
-        mock_pdf.pages = [mock_page]
-        mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
-        mock_pdf.__exit__ = MagicMock(return_value=None)
-        mock_pdfplumber.return_value = mock_pdf
-        
-        # Test extraction
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
-        text = self.extractor._extract_text_from_pdf(file_bytes)
-        
-        assert text == self.sample_contract_text
-        mock_pdfplumber.assert_called_once()
-
-    @patch('src.services.extractor.pdfplumber.open')
-    def test_extract_text_from_pdf_failure(self, mock_pdfplumber):
+        text, n_pages = self.extractor._extract_text_and_pagecount(PDF_BYTES)
+        
+        assert text == "Sample contract text"
+        assert n_pages == 1
+        mock_pymupdf.assert_called_once()
+
+    def test_page_text_joins_words_on_the_same_line(self):
+        """Test words a few points apart vertically end up on one line"""
+        page = MagicMock()
+        page.get_text.return_value = [
+            (120.0, 101.5, 200.0, 111.5, "Industries", 1, 0, 1),
+            (50.0, 100.0, 90.0, 110.0, "Client:", 0, 0, 0),
+            (95.0, 100.0, 115.0, 110.0, "Global", 1, 0, 0),
+            (50.0, 120.0, 90.0, 130.0, "Next", 2, 0, 0),
+        ]
+        assert _page_text(page) == "Client: Global Industries\nNext"
+
+    def test_extract_text_and_pagecount_parallel_matches_sequential(self):
+        """Test page-range extraction keeps pages in order"""
+        doc = pymupdf.open()
+        for page_number in range(7):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {page_number} Client: Acme Corp.")
+        file_bytes = doc.tobytes()
+        doc.close()
+
+        sequential = self.extractor._extract_text_and_pagecount(file_bytes)
+        with patch('src.services.extractor.PDF_PAGE_WORKERS', 3), \
+             patch('src.services.extractor.PDF_PARALLEL_MIN_PAGES', 2), \
+             patch('src.services.extractor._get_page_pool', return_value=ThreadPoolExecutor(max_workers=1)):
+            parallel = self.extractor._extract_text_and_pagecount(file_bytes)
+
+        assert parallel == sequential
+        assert parallel[1] == 7
+        assert parallel[0].startswith("Page 0 ")
+
+    def test_extract_text_and_pagecount_sequential_in_daemon_process(self):
+        """Test daemonic processes (like prefork workers) don't start a page pool"""
+        doc = pymupdf.open()
+        for page_number in range(3):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {page_number}")
+        file_bytes = doc.tobytes()
+        doc.close()
+
+        with patch('src.services.extractor.PDF_PAGE_WORKERS', 3), \
+             patch('src.services.extractor.PDF_PARALLEL_MIN_PAGES', 2), \
+             patch('src.services.extractor.multiprocessing.current_process') as mock_current_process, \
+             patch('src.services.extractor._get_page_pool') as mock_get_page_pool:
+            mock_current_process.return_value.daemon = True
+            text, n_pages = self.extractor._extract_text_and_pagecount(file_bytes)
+
+        mock_get_page_pool.assert_not_called()
+        assert text == "Page 0\nPage 1\nPage 2"
+
+    def test_extract_text_and_pagecount_page_limit(self):
+        """Test pages past MAX_PAGES_PROCESS aren't extracted but are counted"""
+        doc = pymupdf.open()
+        for page_number in range(5):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {page_number}")
+        file_bytes = doc.tobytes()
+        doc.close()
+
+        with patch('src.services.extractor.MAX_PAGES_PROCESS', 2):
+            text, n_pages = self.extractor._extract_text_and_pagecount(file_bytes)
+
+        assert text == "Page 0\nPage 1"
+        assert n_pages == 5
+
+    def test_extract_text_and_pagecount_failure(self, mock_pymupdf):
         """Test PDF extraction failure"""
-        # Mock pdfplumber to raise exception
-        mock_pdfplumber.side_effect = Exception("PDF parsing failed")
-        
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
+        # Mock PyMuPDF to raise exception
+        mock_pymupdf.side_effect = Exception("PDF parsing failed")
         
         with pytest.raises(ExtractionError):
-            self.extractor._extract_text_from_pdf(file_bytes)
+            self.extractor._extract_text_and_pagecount(PDF_BYTES)
 
     def test_extract_parties(self):
         """Test party extraction"""
-        parties = self.extractor._extract_parties(self.sample_contract_text)
+        parties = self.extractor._extract_parties(SAMPLE_CONTRACT_TEXT)
         
         assert len(parties) >= 2
         party_names = [p["name"] for p in parties]
@@ -102,9 +168,27 @@ class TestContractExtractor:
             assert "confidence" in party
             assert 0 <= party["confidence"] <= 100
 
+    def test_entity_name_scanner_matches_regex(self):
+        """Test the linear company-name scanner returns what the regex findall did"""
+        scanner = _EntityNameScanner()
+        regex = re.compile(scanner.pattern, re.IGNORECASE | re.MULTILINE)
+        text = "Acme Widgets Inc. and Beta Company, plus Gamma LLC Company\nNo suffix here"
+
+        assert scanner.findall(text) == regex.findall(text)
+        assert scanner.findall(text) == ["Acme Widgets Inc.", "and Beta Company", "plus Gamma LLC Company"]
+
+    def test_extract_parties_long_prose_is_fast(self):
+        """Test a long run of plain words doesn't backtrack quadratically"""
+        text = " ".join(["Alpha Beta gamma"] * 4000)
+
+        start = time.perf_counter()
+        self.extractor._extract_parties(text)
+
+        assert time.perf_counter() - start < 2
+
     def test_extract_financial_details(self):
         """Test financial details extraction"""
-        financial = self.extractor._extract_financial_details(self.sample_contract_text)
+        financial = self.extractor._extract_financial_details(SAMPLE_CONTRACT_TEXT)
         
         # Check total value
         assert financial.get("total_value") == "$150,000"
@@ -126,7 +210,7 @@ class TestContractExtractor:
 
     def test_extract_payment_structure(self):
         """Test payment structure extraction"""
-        payment = self.extractor._extract_payment_structure(self.sample_contract_text)
+        payment = self.extractor._extract_payment_structure(SAMPLE_CONTRACT_TEXT)
         
         assert payment.get("terms") == "Net 30"
         assert "terms_confidence" in payment
@@ -134,7 +218,7 @@ class TestContractExtractor:
 
     def test_extract_sla_terms(self):
         """Test SLA terms extraction"""
-        sla = self.extractor._extract_sla_terms(self.sample_contract_text)
+        sla = self.extractor._extract_sla_terms(SAMPLE_CONTRACT_TEXT)
         
         assert sla.get("response_time") == "4 hours"
         assert sla.get("uptime_guarantee") == "99.9%"
@@ -142,74 +226,78 @@ class TestContractExtractor:
 
     def test_extract_contact_information(self):
         """Test contact information extraction"""
-        contact = self.extractor._extract_contact_information(self.sample_contract_text)
+        contact = self.extractor._extract_contact_information(SAMPLE_CONTRACT_TEXT)
         
         assert "emails" in contact
         assert "billing@techcorp.com" in contact["emails"]
 
     def test_extract_account_information(self):
         """Test account information extraction"""
-        account = self.extractor._extract_account_information(self.sample_contract_text)
+        account = self.extractor._extract_account_information(SAMPLE_CONTRACT_TEXT)
         
         assert account.get("account_number") == "ACC-2024-001"
         assert "account_confidence" in account
 
+    def test_extract_billing_address_matches_regex(self):
+        """Test the label lookup captures what the address regex did"""
+        texts = [
+            "Billing Address: 1 Main St\nSuite 2\nSpringfield\nIL 62701\nUSA",
+            "Email address\n\n  : 9 Elm Rd\n\nnext paragraph",
+            "ADDRESS:\t42 Oak Ave",
+            "no address\n\n",
+        ]
+
+        for text in texts:
+            match = _ADDRESS_RE.search(text)
+            account = self.extractor._extract_account_information(text)
+            assert account.get("billing_address") == (match.group(1).strip() if match else None)
+
     def test_extract_revenue_classification(self):
         """Test revenue classification extraction"""
-        revenue = self.extractor._extract_revenue_classification(self.sample_contract_text)
+        revenue = self.extractor._extract_revenue_classification(SAMPLE_CONTRACT_TEXT)
         
         assert revenue.get("type") == "Recurring"
         assert revenue.get("billing_cycle") == "Monthly"
 
-    @patch.object(ContractExtractor, '_extract_text_from_pdf')
+    @patch.object(ContractExtractor, '_extract_text_and_pagecount')
     def test_extract_data_full_flow(self, mock_extract_text):
         """Test full data extraction flow"""
-        mock_extract_text.return_value = self.sample_contract_text
+        mock_extract_text.return_value = (SAMPLE_CONTRACT_TEXT, 3)
         
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
-        result = self.extractor.extract_data(file_bytes)
+        result = self.extractor.extract_data(PDF_BYTES)
         
-        # Check all sections are present
-        assert "parties" in result
-        assert "financial_details" in result
-        assert "payment_structure" in result
-        assert "sla_terms" in result
-        assert "contact_information" in result
-        assert "account_information" in result
-        assert "revenue_classification" in result
-        assert "extraction_metadata" in result
+        # Check all sections are present; a failure lists the missing ones
+        assert {
+            "parties", "financial_details", "payment_structure", "sla_terms",
+            "contact_information", "account_information", "revenue_classification",
+            "extraction_metadata"
+        } - result.keys() == set()
         
         # Check metadata
         metadata = result["extraction_metadata"]
-        assert "extraction_method" in metadata
-        assert "text_length" in metadata
+        assert {"extraction_method", "text_length"} - metadata.keys() == set()
+        assert metadata["total_pages"] == 3
 
     def test_extract_data_insufficient_text(self, mock_extract_text):
         """Test extraction with insufficient text content"""
-        mock_extract_text.return_value = "Short text"
-        
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
+        mock_extract_text.return_value = ("Short text", 1)
         
         with pytest.raises(ExtractionError):
-            self.extractor.extract_data(file_bytes)
+            self.extractor.extract_data(PDF_BYTES)
 
     def test_extract_data_empty_text(self, mock_extract_text):
         """Test extraction with empty text content"""
-        mock_extract_text.return_value = ""
-        
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
+        mock_extract_text.return_value = ("", 1)
         
         with pytest.raises(ExtractionError):
-            self.extractor.extract_data(file_bytes)
+            self.extractor.extract_data(PDF_BYTES)
 
     def test_extract_data_whitespace_only(self, mock_extract_text):
         """Test extraction with whitespace-only text content"""
-        mock_extract_text.return_value = "   \n\t  \n  "
-        
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
+        mock_extract_text.return_value = ("   \n\t  \n  ", 1)
         
         with pytest.raises(ExtractionError):
-            self.extractor.extract_data(file_bytes)
+            self.extractor.extract_data(PDF_BYTES)
 
     def test_extract_data_corrupted_pdf(self, mock_extract_text):
         """Test extraction with corrupted PDF that raises exception during text extraction"""
@@ -225,18 +313,30 @@ class TestContractExtractor:
     def test_determine_party_role_client(self):
         """Test party role determination - client"""
         party_name = "Global Industries Ltd."
-        role = self.extractor._determine_party_role(self.sample_contract_text, party_name)
+        role = self.extractor._determine_party_role(SAMPLE_CONTRACT_TEXT, party_name)
         assert role == "Client"
 
     def test_determine_party_role_service_provider(self):
         """Test party role determination - service provider"""
         party_name = "TechCorp Solutions Inc."
-        role = self.extractor._determine_party_role(self.sample_contract_text, party_name)
+        role = self.extractor._determine_party_role(SAMPLE_CONTRACT_TEXT, party_name)
         assert role == "Service Provider"
 
+    def test_determine_party_role_context_stays_on_line(self):
+        """Test party role context doesn't reach across line breaks"""
+        text = "Client contact list\nAcme Widgets supplies the parts"
+        role = self.extractor._determine_party_role(text, "Acme Widgets")
+        assert role == "Party"
+
+    def test_extract_legal_entity_details_later_occurrence(self):
+        """Test legal entity lookup skips occurrences without a suffix"""
+        text = "Acme, as noted above.\nacme holdings inc. agrees"
+        entity = self.extractor._extract_legal_entity_details(text, "Acme")
+        assert entity == "inc."
+
     def test_extract_total_value_found(self):
         """Test total value extraction when present"""
-        result = self.extractor._extract_total_value(self.sample_contract_text)
+        result = self.extractor._extract_total_value(SAMPLE_CONTRACT_TEXT)
         
         assert result is not None
         assert result["value"] == "$150,000"
@@ -251,7 +351,7 @@ class TestContractExtractor:
 
     def test_extract_currency_usd(self):
         """Test currency extraction - USD"""
-        currency = self.extractor._extract_currency(self.sample_contract_text)
+        currency = self.extractor._extract_currency(SAMPLE_CONTRACT_TEXT)
         assert currency == "USD"
 
     def test_extract_currency_eur(self):
@@ -266,23 +366,9 @@ class TestContractExtractor:
         currency = self.extractor._extract_currency(text_without_currency)
         assert currency is None
 
-    @patch('src.services.extractor.pdfplumber.open')
-    def test_count_pages(self, mock_pdfplumber):
-        """Test page counting"""
-        mock_pdf = MagicMock()
-        mock_pdf.pages = [MagicMock(), MagicMock()]  # 2 pages
-        mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
-        mock_pdf.__exit__ = MagicMock(return_value=None)
-        mock_pdfplumber.return_value = mock_pdf
-        
-        file_bytes = b'%PDF-1.4\nTest content\n%%EOF'
-        page_count = self.extractor._count_pages(file_bytes)
-        
-        assert page_count == 2
-
     def test_extract_line_items_multiple(self):
         """Test line items extraction with multiple items"""
-        line_items = self.extractor._extract_line_items(self.sample_contract_text)
+        line_items = self.extractor._extract_line_items(SAMPLE_CONTRACT_TEXT)
         
         assert len(line_items) >= 2
         
@@ -294,14 +380,30 @@ class TestContractExtractor:
         assert "total" in item
         assert isinstance(item["quantity"], int)
 
+    def test_extract_line_items_limited_to_ten(self):
+        """Test line items extraction stops after the first ten items"""
+        text = "\n".join(f"Item {i} 2 $1,000 $2,000" for i in range(25))
+        line_items = self.extractor._extract_line_items(text)
+
+        assert len(line_items) == 10
+        assert line_items[-1]["description"] == "Item 9"
+
     def test_extract_tax_information_found(self):
         """Test tax information extraction when present"""
-        tax_info = self.extractor._extract_tax_information(self.sample_contract_text)
+        tax_info = self.extractor._extract_tax_information(SAMPLE_CONTRACT_TEXT)
         
         assert tax_info is not None
         assert tax_info["rate"] == "8.5%"
         assert tax_info["confidence"] > 0
 
+    def test_extract_tax_information_dotless_i_text(self):
+        """Test texts lowering can't fold like IGNORECASE still match the original patterns"""
+        text = "Tax Rate: 8.5% for Istanbul (İstanbul, ıstanbul)"
+
+        tax_info = self.extractor._extract_tax_information(text)
+
+        assert tax_info["rate"] == "8.5%"
+
     def test_extract_tax_information_not_found(self):
         """Test tax information extraction when not present"""
         text_without_tax = "This contract has no tax information."
@@ -5,7 +5,6 @@ startup, configuration, and basic functionality without mocking.
 """
 
 import pytest
-from fastapi.testclient import TestClient
 
 
 class TestApplicationStartup:
@@ -19,6 +18,13 @@ class TestApplicationStartup:
         assert app.title == "Contract Intelligence Parser"
         assert app.version == "1.0.0"
 
+    def test_default_response_class(self):
+        """Test that responses are serialized with orjson by default"""
+        from src.main import app
+        from src.api.responses import ORJSONResponse
+
+        assert app.router.default_response_class is ORJSONResponse
+
     def test_cors_middleware_configured(self):
         """Test that CORS middleware is properly configured"""
         from src.main import app
@@ -118,16 +124,16 @@ class TestApplicationConfiguration:
         """Test that scoring weights are properly configured"""
         from src.core.config import SCORING_WEIGHTS
 
-        required_weights = [
+        required_weights = {
             "financial_completeness",
             "party_identification",
             "payment_terms_clarity",
             "sla_definition",
             "contact_information"
-        ]
+        }
 
+        assert required_weights - SCORING_WEIGHTS.keys() == set()
         for weight in required_weights:
-            assert weight in SCORING_WEIGHTS
             assert isinstance(SCORING_WEIGHTS[weight], int)
             assert SCORING_WEIGHTS[weight] > 0
 
@@ -135,6 +141,15 @@ class TestApplicationConfiguration:
         total_weight = sum(SCORING_WEIGHTS.values())
         assert 80 <= total_weight <= 120
 
+    def test_scoring_caps_match_weights(self):
+        """Test that the category-indexed caps mirror the scoring weights"""
+        from src.core.config import SCORING_CAPS, SCORING_WEIGHTS, ScoreCategory
+
+        assert len(SCORING_CAPS) == len(ScoreCategory)
+        assert SCORING_CAPS[ScoreCategory.FINANCIAL] == SCORING_WEIGHTS["financial_completeness"]
+        assert SCORING_CAPS[ScoreCategory.CONTACT] == SCORING_WEIGHTS["contact_information"]
+        assert sum(SCORING_CAPS) == sum(SCORING_WEIGHTS.values())
+
 
 class TestApplicationDependencies:
     """Test application dependencies and imports"""
@@ -153,6 +168,7 @@ class TestApplicationDependencies:
         except ImportError as e:
             pytest.fail(f"Failed to import core modules: {e}")
 
+    @pytest.mark.slow
     def test_database_connection_handling(self):
         """Test database connection handling during startup"""
         from src.database.models import mongodb
@@ -165,6 +181,187 @@ class TestApplicationDependencies:
         except Exception as e:
             pytest.fail(f"Database connection handling failed: {e}")
 
+    def test_connect_creates_indexes(self):
+        """Test a successful connect pings, creates indexes and drops obsolete ones"""
+        from unittest.mock import patch
+        from src.database.models import MongoDB, CONTRACT_INDEXES
+
+        with patch("src.database.models.MongoClient") as mock_client_cls:
+            contracts = mock_client_cls.return_value.get_default_database.return_value["contracts"]
+            contracts.index_information.return_value = {"_id_": {}, "created_at_1": {}}
+
+            db = MongoDB("mongodb://localhost:1/test")
+            assert db.connect() is db.db
+            assert db.connect() is db.db
+
+        mock_client_cls.assert_called_once()
+        mock_client_cls.return_value.admin.command.assert_called_once_with('ping')
+        assert contracts.create_index.call_count == len(CONTRACT_INDEXES)
+        contracts.drop_index.assert_called_once_with("created_at_1")
+
+    def test_connect_failure_closes_client(self):
+        """Test a failed ping closes the client and leaves the manager disconnected"""
+        from unittest.mock import patch
+        from src.database.models import MongoDB
+
+        with patch("src.database.models.MongoClient") as mock_client_cls:
+            mock_client_cls.return_value.admin.command.side_effect = Exception("unreachable")
+
+            db = MongoDB("mongodb://localhost:1/test")
+            assert db.connect() is None
+            with pytest.raises(Exception, match="Database not connected"):
+                db.get_collection("contracts")
+
+        mock_client_cls.return_value.close.assert_called()
+        assert db.db is None
+
+    def test_async_connect_creates_indexes(self):
+        """Test the async startup check pings and creates indexes"""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+        from src.database.models import AsyncMongoDB, CONTRACT_INDEXES
+
+        db = AsyncMongoDB("mongodb://localhost:1/test")
+        db.client = MagicMock()
+        db.client.admin.command = AsyncMock()
+        db.client.close = AsyncMock()
+        contracts = MagicMock()
+        contracts.create_index = AsyncMock()
+        contracts.index_information = AsyncMock(return_value={"_id_": {}})
+        contracts.drop_index = AsyncMock()
+        db.db = {"contracts": contracts}
+
+        assert asyncio.run(db.connect()) is db.db
+        assert contracts.create_index.await_count == len(CONTRACT_INDEXES)
+        contracts.drop_index.assert_not_awaited()
+        asyncio.run(db.disconnect())
+        db.client.close.assert_awaited_once()
+
+    def test_connect_reuses_existing_connection(self):
+        """Test connect() returns the open database instead of reconnecting"""
+        from pymongo import MongoClient
+        from src.database.models import MongoDB
+
+        db = MongoDB("mongodb://localhost:1/test")
+        db.client = MongoClient(db.uri, connect=False)
+        db.db = db.client.get_default_database()
+        client = db.client
+
+        assert db.connect() is db.db
+        assert db.client is client
+        db.disconnect()
+
+    @pytest.mark.slow
+    def test_async_database_connection_handling(self):
+        """Test the async startup check tolerates an unreachable MongoDB"""
+        import asyncio
+        from pymongo import AsyncMongoClient
+        from src.database.models import AsyncMongoDB
+
+        async def connect_and_close():
+            db = AsyncMongoDB("mongodb://localhost:1/test")
+            db.client = AsyncMongoClient(db.uri, serverSelectionTimeoutMS=100)
+            db.db = db.client.get_default_database()
+            try:
+                return await db.connect()
+            finally:
+                await db.disconnect()
+
+        assert asyncio.run(connect_and_close()) is None
+
+    def test_collection_handles_cached_until_disconnect(self):
+        """Test collection and bucket handles are reused per connection"""
+        from pymongo import MongoClient
+        from src.database.models import MongoDB
+
+        db = MongoDB("mongodb://localhost:1/test")
+        db.client = MongoClient(db.uri, connect=False)
+        db.db = db.client.get_default_database()
+
+        contracts = db.get_collection("contracts")
+        files = db.get_bucket("contract_files")
+        assert db.get_collection("contracts") is contracts
+        assert db.get_bucket("contract_files") is files
+
+        db.disconnect()
+        assert db._collections == {}
+        assert db._buckets == {}
+        assert db.db is None
+
+    def test_legacy_contract_ids_rekeyed(self):
+        """Test legacy ObjectId contracts are reinserted under their contract id"""
+        from bson import ObjectId
+        from unittest.mock import MagicMock
+        from pymongo.errors import DuplicateKeyError
+        from src.database.migrations import migrate_contract_ids
+
+        legacy_ids = [ObjectId(), ObjectId()]
+        contracts = MagicMock()
+        contracts.find.return_value = [
+            {"_id": legacy_ids[0], "contract_id": "legacy-1", "status": "completed"},
+            {"_id": legacy_ids[1], "contract_id": "legacy-2", "status": "failed"},
+        ]
+        # The second one was copied by an earlier, interrupted run
+        contracts.insert_one.side_effect = [None, DuplicateKeyError("duplicate")]
+
+        assert migrate_contract_ids(contracts) == 2
+        assert contracts.insert_one.call_args_list[0].args[0] == {
+            "_id": "legacy-1", "contract_id": "legacy-1", "status": "completed"
+        }
+        assert [call.args[0] for call in contracts.delete_one.call_args_list] == [
+            {"_id": legacy_ids[0]}, {"_id": legacy_ids[1]}
+        ]
+
+    def test_inline_files_moved_to_gridfs(self):
+        """Test inline PDFs are uploaded to GridFS and unset from the contract"""
+        import hashlib
+        from unittest.mock import MagicMock
+        from src.database.migrations import migrate_inline_files
+
+        contracts = MagicMock()
+        contracts.find.return_value = [
+            {"_id": "legacy-1", "contract_id": "legacy-1", "filename": "a.pdf", "original_file": b"%PDF-1.4 a"},
+        ]
+        files = MagicMock()
+        files.upload_from_stream.return_value = "file-1"
+
+        assert migrate_inline_files(contracts, files) == 1
+        files.upload_from_stream.assert_called_once_with("a.pdf", b"%PDF-1.4 a")
+        contracts.update_one.assert_called_once_with(
+            {"_id": "legacy-1"},
+            {"$set": {"file_id": "file-1", "etag": hashlib.sha1(b"%PDF-1.4 a").hexdigest()},
+             "$unset": {"original_file": ""}}
+        )
+
+    def test_string_dates_migrated(self):
+        """Test the migration converts only string timestamps, server-side"""
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+        from src.database.migrations import migrate_string_dates, DATETIME_FIELDS
+
+        contracts = MagicMock()
+        contracts.update_many.return_value = SimpleNamespace(modified_count=3)
+
+        assert migrate_string_dates(contracts) == {field: 3 for field in DATETIME_FIELDS}
+        query, pipeline = contracts.update_many.call_args_list[0].args
+        assert query == {"upload_date": {"$type": "string"}}
+        assert pipeline[0]["$set"]["upload_date"]["$dateFromString"]["dateString"] == "$upload_date"
+
+    def test_unavailable_compressors_skipped(self):
+        """Test wire compressors without an installed library are dropped"""
+        from src.database.models import available_compressors
+
+        compressors = available_compressors("zstd, snappy,zlib,")
+        assert compressors[-1] == "zlib"
+        assert set(compressors) <= {"zstd", "snappy", "zlib"}
+
+    def test_contracts_have_no_ttl_index(self):
+        """Test no TTL index deletes contracts behind the GridFS cleanup's back"""
+        from src.database.models import CONTRACT_INDEXES, OBSOLETE_CONTRACT_INDEXES
+
+        assert not any("expireAfterSeconds" in options for _, options in CONTRACT_INDEXES)
+        assert "created_at_1" in OBSOLETE_CONTRACT_INDEXES
+
     def test_extractor_initialization(self):
         """Test that contract extractor can be initialized"""
         from src.services.extractor import ContractExtractor
@@ -178,6 +375,8 @@ class TestApplicationDependencies:
             assert len(extractor.currency_patterns) > 0
             assert len(extractor.payment_terms_patterns) > 0
             assert len(extractor.party_patterns) > 0
+            # Patterns are compiled at import and shared, not rebuilt per instance
+            assert ContractExtractor().currency_patterns is extractor.currency_patterns
         except Exception as e:
             pytest.fail(f"Extractor initialization failed: {e}")
 
@@ -12,52 +12,58 @@ Tests cover various scenarios from complete data to edge cases,
 ensuring robust utility function behavior.
 """
 
+import io
+import re
 import pytest
 from unittest.mock import patch
-from datetime import datetime
+from datetime import datetime, timezone
 
+from src.core import utils
 from src.core.utils import (
-    calculate_score, identify_gaps, validate_file, generate_contract_id,
-    get_current_timestamp, extract_confidence_score
+    analyze_contract, calculate_score, identify_gaps, validate_file, validate_file_stream, generate_contract_id,
+    get_current_timestamp, get_current_timestamp_precise, get_current_datetime,
+    extract_confidence_score, context_window
 )
 from src.core.exceptions import FileValidationError
 
 
+@pytest.fixture(scope="class")
+def sample_extracted_data():
+    """Complete extracted data shared by the tests that need it (read-only)"""
+    return {
+        "parties": [
+            {"name": "Company A", "role": "Client", "confidence": 90},
+            {"name": "Company B", "role": "Service Provider", "confidence": 85}
+        ],
+        "financial_details": {
+            "total_value": "$100,000",
+            "currency": "USD",
+            "line_items": [{"description": "Service", "total": "$100,000"}],
+            "tax_information": {"rate": "10%"}
+        },
+        "payment_structure": {
+            "terms": "Net 30",
+            "schedule": "Monthly",
+            "method": "Wire Transfer"
+        },
+        "sla_terms": {
+            "response_time": "4 hours",
+            "uptime_guarantee": "99.9%",
+            "penalties": "5% reduction"
+        },
+        "contact_information": {
+            "billing_contact": "billing@company.com",
+            "technical_contact": "support@company.com"
+        }
+    }
+
+
 class TestCoreUtils:
     """Test cases for core utility functions"""
 
-    def setup_method(self):
-        """Set up test data"""
-        self.sample_extracted_data = {
-            "parties": [
-                {"name": "Company A", "role": "Client", "confidence": 90},
-                {"name": "Company B", "role": "Service Provider", "confidence": 85}
-            ],
-            "financial_details": {
-                "total_value": "$100,000",
-                "currency": "USD",
-                "line_items": [{"description": "Service", "total": "$100,000"}],
-                "tax_information": {"rate": "10%"}
-            },
-            "payment_structure": {
-                "terms": "Net 30",
-                "schedule": "Monthly",
-                "method": "Wire Transfer"
-            },
-            "sla_terms": {
-                "response_time": "4 hours",
-                "uptime_guarantee": "99.9%",
-                "penalties": "5% reduction"
-            },
-            "contact_information": {
-                "billing_contact": "billing@company.com",
-                "technical_contact": "support@company.com"
-            }
-        }
-
-    def test_calculate_score_complete_data(self):
+    def test_calculate_score_complete_data(self, sample_extracted_data):
         """Test score calculation with complete data"""
-        score = calculate_score(self.sample_extracted_data)
+        score = calculate_score(sample_extracted_data)
         
         # Should get maximum score (100) for complete data
         assert score == 100
@@ -169,9 +175,9 @@ class TestCoreUtils:
         # Should get 25 points for complete party identification
         assert score == 25
 
-    def test_identify_gaps_complete_data(self):
+    def test_identify_gaps_complete_data(self, sample_extracted_data):
         """Test gap identification with complete data"""
-        gaps = identify_gaps(self.sample_extracted_data)
+        gaps = identify_gaps(sample_extracted_data)
         
         # Complete data should have no gaps
         assert len(gaps) == 0
@@ -221,6 +227,22 @@ class TestCoreUtils:
         gap_fields = [gap["field"] for gap in gaps]
         assert "Payment Terms" in gap_fields
 
+    def test_analyze_contract_matches_score_and_gaps(self, sample_extracted_data):
+        """Test the single-pass analysis agrees with the separate helpers"""
+        for data in (sample_extracted_data, {}, {"parties": [{"name": "Company A"}]}):
+            score, gaps = analyze_contract(data)
+            
+            assert score == calculate_score(data)
+            assert gaps == identify_gaps(data)
+
+    def test_analyze_contract_gaps_are_copies(self):
+        """Test modifying returned gaps doesn't leak into later analyses"""
+        for data in ({}, {"parties": [{"name": "Company A"}]}):
+            _, gaps = analyze_contract(data)
+            gaps[0]["status"] = "Reviewed"
+            
+            assert analyze_contract(data)[1][0]["status"] != "Reviewed"
+
     def test_identify_gaps_missing_sla(self):
         """Test gap identification with missing SLA terms"""
         incomplete_data = {
@@ -235,14 +257,13 @@ class TestCoreUtils:
         gap_fields = [gap["field"] for gap in gaps]
         assert "Service Level Agreements" in gap_fields
 
-    def test_validate_file_valid_pdf(self):
+    def test_validate_file_valid_pdf(self, sample_pdf_content):
         """Test file validation with valid PDF"""
-        pdf_content = b'%PDF-1.4\nTest PDF content\n%%EOF'
         filename = "test.pdf"
         max_size = 1000000  # 1MB
         
         # Should not raise exception
-        result = validate_file(pdf_content, filename, max_size)
+        result = validate_file(sample_pdf_content, filename, max_size)
         assert result is True
 
     def test_validate_file_invalid_extension(self):
@@ -289,6 +310,31 @@ class TestCoreUtils:
         
         assert "File is not a valid PDF" in str(exc_info.value)
 
+    def test_validate_file_requires_full_magic_bytes(self):
+        """Test file validation rejects a truncated %PDF- signature"""
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_file(b'%PDF1.4\nTest', "test.pdf", 1000000)
+        
+        assert "File is not a valid PDF" in str(exc_info.value)
+
+    def test_validate_file_stream_valid_pdf(self):
+        """Test stream validation returns the size and rewinds the file"""
+        pdf_content = b'%PDF-1.4\n' + b'x' * 4096
+        fp = io.BytesIO(pdf_content)
+        fp.seek(100)
+        
+        assert validate_file_stream(fp, "test.pdf", 1000000) == len(pdf_content)
+        assert fp.tell() == 0
+
+    def test_validate_file_stream_too_large(self):
+        """Test stream validation rejects oversized files from their size alone"""
+        fp = io.BytesIO(b'%PDF-1.4\n' + b'x' * 2000)
+        
+        with pytest.raises(FileValidationError) as exc_info:
+            validate_file_stream(fp, "test.pdf", 1000)
+        
+        assert "File size exceeds maximum limit" in str(exc_info.value)
+
     def test_generate_contract_id(self):
         """Test contract ID generation"""
         contract_id1 = generate_contract_id()
@@ -301,9 +347,10 @@ class TestCoreUtils:
         # Should be unique
         assert contract_id1 != contract_id2
         
-        # Should be UUID format (length check)
-        assert len(contract_id1) == 36  # UUID4 string length
-        assert len(contract_id2) == 36
+        # Should be a hex UUID4 (no hyphens)
+        assert len(contract_id1) == 32
+        assert len(contract_id2) == 32
+        int(contract_id1, 16)
 
     def test_get_current_timestamp(self):
         """Test current timestamp generation"""
@@ -319,6 +366,36 @@ class TestCoreUtils:
         except ValueError:
             pytest.fail("Timestamp is not in valid ISO format")
 
+    def test_get_current_timestamp_cached_per_second(self):
+        """Test timestamps are formatted once per second"""
+        with patch('src.core.utils.time.time', return_value=1704067200.25):
+            first = get_current_timestamp()
+        with patch('src.core.utils.time.time', return_value=1704067200.75):
+            second = get_current_timestamp()
+        with patch('src.core.utils.time.time', return_value=1704067201.5):
+            third = get_current_timestamp()
+        
+        assert first == second == "2024-01-01T00:00:00"
+        assert third == "2024-01-01T00:00:01"
+
+    def test_get_current_timestamp_precise(self):
+        """Test precise timestamps keep sub-second resolution"""
+        with patch('src.core.utils.time.time', return_value=1704067200.25):
+            timestamp = get_current_timestamp_precise()
+        
+        assert timestamp == "2024-01-01T00:00:00.250000"
+        assert isinstance(datetime.fromisoformat(timestamp), datetime)
+
+    def test_get_current_datetime(self):
+        """Test current datetime generation"""
+        now = get_current_datetime()
+        
+        # Should be an aware UTC datetime close to the ISO timestamp clock
+        assert isinstance(now, datetime)
+        assert now.tzinfo is timezone.utc
+        timestamp = datetime.fromisoformat(get_current_timestamp()).replace(tzinfo=timezone.utc)
+        assert abs((timestamp - now).total_seconds()) < 5
+
     def test_extract_confidence_score_match_found(self):
         """Test confidence score extraction with matches found"""
         text = "The total amount is $50,000 for this contract."
@@ -368,5 +445,41 @@ class TestCoreUtils:
         assert result["confidence"] > 85  # Base confidence + boost
 
 
+    def test_extract_confidence_score_compiled_pattern(self):
+        """Test a precompiled pattern scores the same as its source string"""
+        text = "The total amount is $50,000 for this contract."
+        pattern = r'\$(\d{1,3}(?:,\d{3})*)'
+        compiled = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        
+        assert extract_confidence_score(text, compiled, "amount") == extract_confidence_score(text, pattern, "amount")
+
+    def test_extract_confidence_score_reuses_compiled_string_pattern(self):
+        """Test a pattern string is compiled once and then served from the cache"""
+        pattern = r'Net\s*(\d+)\s*days?'
+        extract_confidence_score("Net 30 days", pattern, "payment")
+        hits = utils._compile.cache_info().hits
+        
+        extract_confidence_score("Net 45 days", pattern, "payment")
+        
+        assert utils._compile.cache_info().hits == hits + 1
+
+    def test_extract_confidence_score_search_lower(self):
+        """Test a lowercase pattern run over the lowered text keeps the original case"""
+        text = "Payment Method: Wire Transfer. payment method: ACH"
+        folded = re.compile(r'payment\s*method[\s:]*([^\n\.]+)', re.MULTILINE)
+        
+        result = extract_confidence_score(text, folded, "method", text.lower(), search_lower=True)
+        
+        assert result == extract_confidence_score(text, r'Payment\s*Method[\s:]*([^\n\.]+)', "method")
+        assert result["value"] == ["Wire Transfer", "ACH"]
+
+    def test_context_window_matches_regex_window(self):
+        """Test the str.find window equals the .{0,N} regex window it replaces"""
+        text = "header line\n" + "x" * 60 + " net 30 days due " + "y" * 60 + "\nnet 45"
+        expected = re.search(r".{0,50}" + re.escape("net") + r".{0,50}", text).group()
+        
+        assert context_window(text, "net", 50) == expected
+        assert context_window(text, "absent", 50) is None
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])